@@ -1,8 +1,53 @@
-from flask import Flask, render_template, request, jsonify, redirect, url_for, session, flash
+from flask import Flask, Response, render_template, request, jsonify, redirect, url_for, session, flash, g, stream_with_context, abort
+from flask import current_app, send_from_directory
+from flask import before_render_template, has_request_context, template_rendered
+from flask.json.provider import DefaultJSONProvider
 from flask_sqlalchemy import SQLAlchemy
-from datetime import datetime, timedelta
+from flask_sqlalchemy.session import Session as FlaskSQLAlchemySession
+from sqlalchemy import event as sqlalchemy_event, exc as sqlalchemy_exc
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+from datetime import date, datetime, timedelta
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+import bisect
+import glob
+import gzip
+import hashlib
+import heapq
+import hmac
+import csv
+import io
+import json
+import math
+import mimetypes
 import os
+import pickle
+import queue
+import random
+import re
+import select
+import shlex
+import sys
+import threading
+import time
+import click
 from dotenv import load_dotenv
+from itsdangerous import BadSignature, URLSafeSerializer
+from jinja2 import FileSystemBytecodeCache
+from werkzeug.http import is_resource_modified
+
+try:
+    import orjson
+except ImportError:  # optional - falls back to Flask's json encoder
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # optional - build-assets then writes gzip variants only
+    brotli = None
 
 # Load environment variables
 # Get the directory where this script is located
@@ -20,43 +65,469 @@ def env_bool(var_name, default=False):
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'your-secret-key-change-in-production')
+app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+
 
-# Database configuration - PostgreSQL only
-database_url = os.getenv('DATABASE_URL')
-
-if database_url:
-    # Database URL provided explicitly
-    app.config['SQLALCHEMY_DATABASE_URI'] = database_url
-    print("Using database from DATABASE_URL")
-elif os.getenv('DB_HOST'):
-    # PostgreSQL from individual environment variables
-    db_user = os.getenv('DB_USER', 'postgres')
-    db_password = os.getenv('DB_PASSWORD', '')
-    db_host = os.getenv('DB_HOST', 'localhost')
-    db_port = os.getenv('DB_PORT', '5432')
-    db_name = os.getenv('DB_NAME', 'lost_found')
-    app.config['SQLALCHEMY_DATABASE_URI'] = f'postgresql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}'
-    print(f"Connected to PostgreSQL database: {db_name} on {db_host}:{db_port}")
-else:
-    # PostgreSQL is required
+def database_url_from_env():
+    """PostgreSQL URL from DATABASE_URL or the DB_* variables - PostgreSQL only"""
+    database_url = os.getenv('DATABASE_URL')
+    if database_url:
+        return database_url
+    if os.getenv('DB_HOST'):
+        db_user = os.getenv('DB_USER', 'postgres')
+        db_password = os.getenv('DB_PASSWORD', '')
+        db_host = os.getenv('DB_HOST', 'localhost')
+        db_port = os.getenv('DB_PORT', '5432')
+        db_name = os.getenv('DB_NAME', 'lost_found')
+        return f'postgresql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}'
     raise ValueError(
         "PostgreSQL database configuration is required. "
         "Please set either DATABASE_URL or provide DB_HOST, DB_PORT, DB_NAME, DB_USER, and DB_PASSWORD "
         "in your .env file."
     )
 
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+
+# Optional streaming replica that serves read-only requests (see "# Read replica")
+replica_url = os.getenv('DATABASE_REPLICA_URL')
 
 # PostgreSQL-specific configuration
+# Each gunicorn worker keeps its own pool and may open up to DB_POOL_SIZE + DB_MAX_OVERFLOW
+# connections (per database), so workers x that must stay below the server's max_connections.
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '5'))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '10'))
+DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', '30'))  # seconds to wait for a free connection
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '300'))
+# "always" tests every checkout with a round trip, "idle" only connections unused for
+# DB_PRE_PING_IDLE_SECONDS, "never" relies on DB_POOL_RECYCLE alone
+DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'idle')
+DB_PRE_PING_IDLE_SECONDS = int(os.getenv('DB_PRE_PING_IDLE_SECONDS', '30'))
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', '0'))  # 0 = no limit
+# PgBouncer in transaction pooling mode drops session state between transactions, so
+# settings are applied per transaction instead of as connection startup options
+DB_PGBOUNCER = env_bool('DB_PGBOUNCER', False)
+# LISTEN needs a session of its own, which PgBouncer in transaction pooling mode cannot
+# give, so the live feed and task worker listeners can connect to PostgreSQL directly
+LISTEN_DATABASE_URL = os.getenv('LISTEN_DATABASE_URL')
+
+if DB_POOL_PRE_PING not in ('always', 'idle', 'never'):
+    raise ValueError("DB_POOL_PRE_PING must be 'always', 'idle' or 'never'")
+
+connect_args = {'connect_timeout': int(os.getenv('DB_CONNECT_TIMEOUT', '10'))}
+if DB_STATEMENT_TIMEOUT_MS and not DB_PGBOUNCER:
+    connect_args['options'] = f'-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}'
+
 app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
-    'pool_pre_ping': True,
-    'pool_recycle': 300,
-    'connect_args': {
-        'connect_timeout': 10
-    }
+    'pool_size': DB_POOL_SIZE,
+    'max_overflow': DB_MAX_OVERFLOW,
+    'pool_timeout': DB_POOL_TIMEOUT,
+    'pool_recycle': DB_POOL_RECYCLE,
+    'pool_pre_ping': DB_POOL_PRE_PING == 'always',
+    'connect_args': connect_args
 }
 
-db = SQLAlchemy(app)
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that serializes jsonify() responses and dumps() with orjson
+
+    Dates and other non-native types still go through Flask's default
+    conversion and keys are sorted when sort_keys is set, so the JSON is the
+    same as with the default provider, except that non-ASCII text is sent as
+    UTF-8 rather than \\u escapes. Indented output (debug mode or compact=False)
+    and dumps() calls with json.dumps arguments other than sort_keys use the
+    default provider.
+    """
+
+    def _encode(self, obj, option=0, sort_keys=None):
+        option |= orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys if sort_keys is None else sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option)
+
+    def dumps(self, obj, **kwargs):
+        if set(kwargs) - {'sort_keys'}:
+            return super().dumps(obj, **kwargs)
+        return self._encode(obj, sort_keys=kwargs.get('sort_keys')).decode()
+
+    def response(self, *args, **kwargs):
+        if (self.compact is None and current_app.debug) or self.compact is False:
+            return super().response(*args, **kwargs)
+        if args and kwargs:
+            raise TypeError('app.json.response() takes either args or kwargs, not both')
+        obj = args[0] if len(args) == 1 else (args or kwargs or None)
+        return current_app.response_class(self._encode(obj, orjson.OPT_APPEND_NEWLINE), mimetype=self.mimetype)
+
+
+# JSON encoder for API responses: orjson when installed, unless JSON_PROVIDER=default
+if orjson is not None and os.getenv('JSON_PROVIDER', 'orjson') == 'orjson':
+    app.json = OrjsonProvider(app)
+
+# Metrics
+# Per-process request, SQL, template and connection-pool timings, exposed at /metrics
+# in the Prometheus text format. Each gunicorn worker reports its own numbers.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+
+class Histogram:
+    """Prometheus-style cumulative histogram, one series per label set"""
+
+    def __init__(self, name, help_text, labels, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = buckets
+        self._series = {}  # label values -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.setdefault(label_values, [0] * (len(self.buckets) + 2))
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            series = {labels: list(values) for labels, values in self._series.items()}
+        for label_values, values in sorted(series.items()):
+            labels = prometheus_labels(self.labels, label_values)
+            bucket_names = self.labels + ('le',)
+            cumulative = 0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{prometheus_labels(bucket_names, label_values + (bound,))} {cumulative}')
+            lines.append(f'{self.name}_bucket{prometheus_labels(bucket_names, label_values + ("+Inf",))} {values[-1]}')
+            lines.append(f'{self.name}_sum{labels} {values[-2]}')
+            lines.append(f'{self.name}_count{labels} {values[-1]}')
+        return lines
+
+
+class CounterMetric:
+    """Prometheus-style monotonically increasing counter, one series per label set"""
+
+    def __init__(self, name, help_text, labels):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount, *label_values):
+        with self._lock:
+            self._series[label_values] = self._series.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        with self._lock:
+            series = dict(self._series)
+        for label_values, value in sorted(series.items()):
+            lines.append(f'{self.name}{prometheus_labels(self.labels, label_values)} {value}')
+        return lines
+
+
+class GaugeMetric:
+    """Prometheus-style gauge whose values are read by collect() at scrape time"""
+
+    def __init__(self, name, help_text, labels, collect):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.collect = collect  # yields (label values, value)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} gauge']
+        for label_values, value in sorted(self.collect()):
+            lines.append(f'{self.name}{prometheus_labels(self.labels, label_values)} {value}')
+        return lines
+
+
+def prometheus_labels(names, values):
+    """Format a label set for the Prometheus text format, e.g. {endpoint="search",method="GET"}"""
+    if not names:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for value in values)
+    return '{' + ','.join(f'{name}="{value}"' for name, value in zip(names, escaped)) + '}'
+
+
+REQUEST_LATENCY = Histogram('lost_found_request_duration_seconds',
+                            'Time spent handling a request, by endpoint', ('endpoint', 'method'))
+REQUESTS = CounterMetric('lost_found_requests_total', 'Requests handled, by endpoint and status code',
+                         ('endpoint', 'method', 'status'))
+REQUEST_SQL_QUERIES = Histogram('lost_found_request_sql_queries', 'SQL statements executed per request, by endpoint',
+                                ('endpoint',), buckets=QUERY_COUNT_BUCKETS)
+REQUEST_SQL_TIME = Histogram('lost_found_request_sql_duration_seconds', 'Time spent in SQL per request, by endpoint',
+                             ('endpoint',))
+SQL_QUERIES = CounterMetric('lost_found_sql_queries_total', 'SQL statements executed', ())
+SQL_TIME = CounterMetric('lost_found_sql_duration_seconds_total', 'Time spent executing SQL statements', ())
+TEMPLATE_RENDER_TIME = Histogram('lost_found_template_render_seconds', 'Time spent rendering a template',
+                                 ('template',))
+POOL_CHECKOUT_WAIT = Histogram('lost_found_db_pool_checkout_seconds',
+                               'Time to get a connection from the pool, including connecting when it grows', ())
+POOL_TIMEOUTS = CounterMetric('lost_found_db_pool_timeouts_total',
+                              'Checkouts that gave up after DB_POOL_TIMEOUT with every connection in use', ())
+
+
+def pool_connection_counts():
+    """Connections of each engine's pool in this worker by state, and the most it may open"""
+    for bind_key, engine in db.engines.items():
+        pool = engine.pool
+        if isinstance(pool, QueuePool) and bind_key != 'listen':  # listener connections leave the pool
+            engine_name = bind_key or 'primary'
+            yield (engine_name, 'checked_out'), pool.checkedout()
+            yield (engine_name, 'idle'), pool.checkedin()
+            yield (engine_name, 'overflow'), max(0, pool.overflow())
+            yield (engine_name, 'max'), pool.size() + DB_MAX_OVERFLOW
+
+
+POOL_CONNECTIONS = GaugeMetric('lost_found_db_pool_connections',
+                               'Pool connections by state (checked_out, idle, overflow) and the max allowed',
+                               ('engine', 'state'), pool_connection_counts)
+
+METRICS = (REQUEST_LATENCY, REQUESTS, REQUEST_SQL_QUERIES, REQUEST_SQL_TIME, SQL_QUERIES, SQL_TIME,
+           TEMPLATE_RENDER_TIME, POOL_CHECKOUT_WAIT, POOL_TIMEOUTS, POOL_CONNECTIONS)
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waits for a connection"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except sqlalchemy_exc.TimeoutError:
+            POOL_TIMEOUTS.inc(1)
+            raise
+        finally:
+            POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started)
+
+
+app.config['SQLALCHEMY_ENGINE_OPTIONS']['poolclass'] = TimedQueuePool
+
+
+@sqlalchemy_event.listens_for(TimedQueuePool, 'checkin')
+def remember_checkin_time(dbapi_connection, connection_record):
+    connection_record.info['checked_in_at'] = time.monotonic()
+
+
+@sqlalchemy_event.listens_for(TimedQueuePool, 'checkout')
+def ping_idle_connection(dbapi_connection, connection_record, connection_proxy):
+    """With DB_POOL_PRE_PING=idle, test connections that sat unused long enough to have been dropped"""
+    if DB_POOL_PRE_PING != 'idle':
+        return
+    checked_in_at = connection_record.info.get('checked_in_at')
+    if checked_in_at is None or time.monotonic() - checked_in_at < DB_PRE_PING_IDLE_SECONDS:
+        return
+    try:
+        cursor = dbapi_connection.cursor()
+        cursor.execute('SELECT 1')
+        cursor.close()
+        dbapi_connection.rollback()
+    except Exception:
+        # The pool discards this connection and retries the checkout with a new one
+        raise sqlalchemy_exc.DisconnectionError()
+
+
+@sqlalchemy_event.listens_for(Engine, 'begin')
+def set_transaction_statement_timeout(conn):
+    """Behind PgBouncer the statement timeout cannot be a startup option, so set it per transaction"""
+    if DB_PGBOUNCER and DB_STATEMENT_TIMEOUT_MS:
+        conn.exec_driver_sql(f'SET LOCAL statement_timeout = {DB_STATEMENT_TIMEOUT_MS}')
+
+
+@sqlalchemy_event.listens_for(Engine, 'before_cursor_execute')
+def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info['query_started'] = time.perf_counter()
+
+
+@sqlalchemy_event.listens_for(Engine, 'after_cursor_execute')
+def record_query_time(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info.pop('query_started')
+    SQL_QUERIES.inc(1)
+    SQL_TIME.inc(elapsed)
+    if has_request_context() and 'request_started' in g:
+        g.sql_queries += 1
+        g.sql_seconds += elapsed
+        if g.sql_statements is not None:
+            g.sql_statements.append(statement)
+
+
+@before_render_template.connect_via(app)
+def start_render_timer(sender, template, context, **extra):
+    g.setdefault('render_started', []).append(time.perf_counter())
+
+
+@template_rendered.connect_via(app)
+def record_render_time(sender, template, context, **extra):
+    started = g.get('render_started')
+    if started:
+        TEMPLATE_RENDER_TIME.observe(time.perf_counter() - started.pop(), template.name)
+
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+    g.sql_queries = 0
+    g.sql_seconds = 0.0
+    g.sql_statements = [] if query_budgets_enabled() else None
+
+
+@app.after_request
+def record_request_metrics(response):
+    if 'request_started' in g and request.endpoint not in ('static', 'metrics'):
+        endpoint = request.endpoint or 'unmatched'
+        REQUEST_LATENCY.observe(time.perf_counter() - g.request_started, endpoint, request.method)
+        REQUESTS.inc(1, endpoint, request.method, str(response.status_code))
+        REQUEST_SQL_QUERIES.observe(g.sql_queries, endpoint)
+        REQUEST_SQL_TIME.observe(g.sql_seconds, endpoint)
+    return response
+
+
+def render_metrics():
+    """All metrics in the Prometheus text exposition format"""
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+# Query budgets
+# Views declare the most SQL statements one request may run; with QUERY_BUDGETS=true
+# (or app.testing) every request is checked against its budget and for N+1 patterns.
+QUERY_REPEAT_LIMIT = 3  # the same statement this many times in one request is reported as an N+1
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """Raised in testing when a request runs more SQL than its view allows"""
+
+
+def query_budget(max_queries, methods=('GET',)):
+    """Declare the most SQL statements a view may run per request (apply below @app.route)
+
+    Budgets should leave room for the periodic admin-flag re-check (one query).
+    """
+    def decorator(f):
+        f.query_budgets = {method: max_queries for method in methods}
+        return f
+    return decorator
+
+
+def query_budgets_enabled():
+    return app.testing or env_bool('QUERY_BUDGETS', False)
+
+
+def query_budget_problems(budget, statements):
+    """Describe how a request's statements break its budget; empty if they don't"""
+    problems = []
+    if budget is not None and len(statements) > budget:
+        problems.append(f'{len(statements)} statements, budget is {budget}')
+    repeats = sorted(
+        (count, statement) for statement, count in Counter(statements).items() if count >= QUERY_REPEAT_LIMIT
+    )
+    for count, statement in reversed(repeats):
+        problems.append(f'same statement run {count} times (N+1?): {statement}')
+    return problems
+
+
+def query_budget_urls():
+    """(rule, url) for every GET route with a query budget; url is None if no row fills its arguments
+
+    URL arguments are taken from existing rows. Used by check-query-budgets and the tests.
+    """
+    url_values = {
+        'report_id': db.session.execute(db.select(LostFoundItem.id).limit(1)).scalar(),
+        'item_name': db.session.execute(db.select(Item.name).limit(1)).scalar(),
+    }
+    for rule in app.url_map.iter_rules():
+        if 'GET' not in getattr(app.view_functions[rule.endpoint], 'query_budgets', {}):
+            continue
+        if any(url_values.get(argument) is None for argument in rule.arguments):
+            yield rule, None
+            continue
+        with app.test_request_context():
+            yield rule, url_for(rule.endpoint, **{argument: url_values[argument] for argument in rule.arguments})
+
+
+@app.after_request
+def check_query_budget(response):
+    statements = g.get('sql_statements')
+    if statements is None or request.endpoint in (None, 'static'):
+        return response
+    
+    budget = getattr(app.view_functions[request.endpoint], 'query_budgets', {}).get(request.method)
+    problems = query_budget_problems(budget, statements)
+    if problems:
+        message = (f'Query budget exceeded by {request.method} {request.path} ({request.endpoint}): '
+                   + '; '.join(problems) + '\n' + '\n'.join(f'  {statement}' for statement in statements))
+        app.logger.error(message)
+        if app.testing:
+            raise QueryBudgetExceeded(message)
+    return response
+
+
+# Read replica
+# With DATABASE_REPLICA_URL set, GET and HEAD requests read from the replica and everything
+# else uses the primary. A user who has just written is kept on the primary (and off the
+# response cache) for REPLICA_STICKY_SECONDS, longer than the replica should lag, so they
+# always see their own change.
+REPLICA_STICKY_SECONDS = int(os.getenv('REPLICA_STICKY_SECONDS', '10'))
+READ_ONLY_METHODS = ('GET', 'HEAD')
+
+
+class RoutingSession(FlaskSQLAlchemySession):
+    """Session that sends a read-only request's queries to the replica engine
+
+    Flushes and DML statements always go to the primary, and once a session has
+    written, the rest of its reads follow so they see the write.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and has_request_context() and g.get('use_replica'):
+            if self._flushing or getattr(clause, 'is_dml', False):
+                self.info['wrote_to_primary'] = True
+            elif not self.info.get('wrote_to_primary'):
+                return self._db.engines['replica']
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@app.before_request
+def choose_database():
+    if not replica_url:
+        return
+    reading_own_writes = session.get('primary_until', 0) > time.time()
+    g.use_replica = request.method in READ_ONLY_METHODS and not reading_own_writes
+    # Cached view data may have been computed on the replica before the write replicated
+    g.skip_cache_read = reading_own_writes
+
+
+@contextmanager
+def primary_reads():
+    """Send this request's reads to the primary inside the block, even on a replica-routed GET
+
+    Used for anything shared with other users (response cache fills, table versions
+    behind ETags): read from a lagging replica right after a write, they would hand
+    the old data to everyone until the next write or CACHE_TTL.
+    """
+    if not (has_request_context() and g.get('use_replica')):
+        yield
+        return
+    g.use_replica = False
+    try:
+        yield
+    finally:
+        g.use_replica = True
+
+
+@app.after_request
+def stick_to_primary_after_write(response):
+    if replica_url and request.method not in READ_ONLY_METHODS + ('OPTIONS',) and response.status_code < 400:
+        session['primary_until'] = time.time() + REPLICA_STICKY_SECONDS
+    return response
+
+
+db = SQLAlchemy(session_options={'class_': RoutingSession})  # bound to the app by create_app()
 
 # Database Models
 class User(db.Model):
@@ -84,13 +555,14 @@ class User(db.Model):
 
 
 class Item(db.Model):
-    """Lost and Found Item model - Simplified with name as primary key"""
+    """Lost and Found Item model"""
     # Primary key
-    name = db.Column(db.String(200), primary_key=True)  # Item Name *
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(200), nullable=False, unique=True, index=True)  # Item Name * (unique)
     
     # Required fields
     category = db.Column(db.String(50), nullable=False)  # Category *
-    date = db.Column(db.Date, nullable=False)  # Date *
+    date = db.Column(db.Date, nullable=False, index=True)  # Date *
     description = db.Column(db.Text, nullable=False)  # Description *
     
     # Optional fields
@@ -103,8 +575,9 @@ class LostFoundItem(db.Model):
     """Lost and Found Items reported through report screen"""
     id = db.Column(db.Integer, primary_key=True)
     
-    # Item information - name is foreign key to Item table (composite key)
-    name = db.Column(db.String(200), db.ForeignKey('item.name'), nullable=False)  # Item Name * (Foreign Key)
+    # Item information - item_id is the foreign key to Item; name and category are copied from it
+    item_id = db.Column(db.Integer, db.ForeignKey('item.id'), nullable=False, index=True)  # Item (Foreign Key)
+    name = db.Column(db.String(200), nullable=False)  # Item Name *
     category = db.Column(db.String(50), nullable=False)  # Category *
     date = db.Column(db.Date, nullable=False)  # Date Lost/Found *
     location = db.Column(db.String(200), nullable=False)  # Location Lost/Found *
@@ -126,18 +599,1963 @@ class LostFoundItem(db.Model):
     
     # Relationship to Item table
     item = db.relationship('Item', backref=db.backref('lost_found_items', lazy=True))
+    
+    __table_args__ = (
+        # Report lists and search filter on status and sort by date
+        db.Index('ix_lost_found_item_status_date', 'status', 'date'),
+        # Matching engine blocking key: same category, opposite status, within a date window
+        db.Index('ix_lost_found_item_category_status_date', 'category', 'status', 'date'),
+        # Recent activity on the dashboard and about page
+        db.Index('ix_lost_found_item_created_at', 'created_at'),
+    )
+
+
+class StatCounter(db.Model):
+    """Running totals for the dashboard and about page, kept up to date on every write"""
+    __tablename__ = 'stat_counter'
+    metric = db.Column(db.String(50), primary_key=True)  # e.g. 'reports', 'reports_by_day:lost'
+    bucket = db.Column(db.String(100), primary_key=True, default='')  # '' for totals, ISO date or category otherwise
+    value = db.Column(db.BigInteger, nullable=False, default=0)
+
+
+class ReportMatch(db.Model):
+    """Possible pairing of a lost report with a found report, scored by the matching engine"""
+    __tablename__ = 'report_match'
+    id = db.Column(db.Integer, primary_key=True)
+    lost_id = db.Column(db.Integer, db.ForeignKey('lost_found_item.id', ondelete='CASCADE'), nullable=False, index=True)
+    found_id = db.Column(db.Integer, db.ForeignKey('lost_found_item.id', ondelete='CASCADE'), nullable=False, index=True)
+    score = db.Column(db.Float, nullable=False)  # 0..1, higher is a better match
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (db.UniqueConstraint('lost_id', 'found_id'),)
+
+
+class SchemaMigration(db.Model):
+    """Schema migrations that have been applied to this database"""
+    __tablename__ = 'schema_migration'
+    version = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    name = db.Column(db.String(200), nullable=False)
+    applied_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+
+class BackgroundTask(db.Model):
+    """Work queued by a request to run after it commits, picked up by `flask run-worker`"""
+    __tablename__ = 'background_task'
+    id = db.Column(db.BigInteger, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)  # key into TASK_HANDLERS
+    payload = db.Column(db.JSON, nullable=False, default=dict)  # keyword arguments for the handler
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, running, done or failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.Text, nullable=True)
+    run_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)  # not before; pushed back on retry
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (
+        # Workers claim due tasks in run_at order
+        db.Index('ix_background_task_status_run_at', 'status', 'run_at'),
+    )
+
+
+# Search
+SEARCH_TOKEN_RE = re.compile(r'[^\W_]+')
+
+
+def tokenize(text):
+    """Split text into lowercase search tokens"""
+    return SEARCH_TOKEN_RE.findall((text or '').lower())
+
+
+class PostgresSearchBackend:
+    """Full-text search using a generated tsvector column with a GIN index"""
+    name = 'postgres'
+
+    # The column is generated by PostgreSQL, so inserts and updates keep it current
+    SETUP_STATEMENTS = [
+        """
+        ALTER TABLE lost_found_item ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(location, '')), 'B') ||
+            setweight(to_tsvector('simple', coalesce(description, '')), 'C')
+        ) STORED
+        """,
+        'CREATE INDEX IF NOT EXISTS ix_lost_found_item_search_vector '
+        'ON lost_found_item USING gin (search_vector)',
+    ]
+
+    # Trigram index for the location substring filter (needs the pg_trgm extension)
+    TRIGRAM_STATEMENTS = [
+        'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+        'CREATE INDEX IF NOT EXISTS ix_lost_found_item_location_trgm '
+        'ON lost_found_item USING gin (location gin_trgm_ops)',
+    ]
+
+    def setup(self):
+        """Create the search column and indexes if they are missing"""
+        with db.engine.begin() as conn:
+            for statement in self.SETUP_STATEMENTS:
+                conn.execute(db.text(statement))
+        try:
+            with db.engine.begin() as conn:
+                for statement in self.TRIGRAM_STATEMENTS:
+                    conn.execute(db.text(statement))
+        except Exception as e:
+            app.logger.warning(f'Trigram index not created (location filter will scan): {str(e)}')
+
+    def match(self, term):
+        """Return (filter criterion, rank expression) for a search term"""
+        tokens = tokenize(term)
+        if not tokens:
+            return None, None
+        ts_query = db.func.to_tsquery('simple', ' & '.join(f'{token}:*' for token in tokens))
+        vector = db.literal_column('lost_found_item.search_vector')
+        # ts_rank returns a real; double precision round-trips exactly through pagination cursors
+        rank = db.cast(db.func.ts_rank(vector, ts_query), db.Float(precision=53))
+        return vector.op('@@')(ts_query), rank
+
+    def on_commit(self, changed, deleted):
+        """Nothing to do - PostgreSQL maintains the index itself"""
+
+    def invalidate(self):
+        """Nothing to do - PostgreSQL maintains the index itself"""
+
+
+class MemorySearchBackend:
+    """In-process inverted index over LostFoundItem (for tests and local development)
+
+    Single process only: writes reach the index of the worker that made them, so
+    other gunicorn workers keep answering from their own stale copy. create_app()
+    warns when it is enabled with more than one worker.
+    """
+    name = 'memory'
+
+    # Field weights, matching the A/B/C weights of the PostgreSQL backend
+    FIELD_WEIGHTS = (('name', 1.0), ('location', 0.4), ('description', 0.2))
+
+    def __init__(self):
+        self._postings = {}  # token -> {item id: weight}
+        self._tokens = []  # sorted tokens, for prefix lookups
+        self._documents = {}  # item id -> tokens
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def setup(self):
+        """Nothing to create - the index is built lazily on first search"""
+
+    def _add(self, item_id, fields):
+        weights = {}
+        for field, weight in self.FIELD_WEIGHTS:
+            for token in tokenize(fields.get(field)):
+                weights[token] = max(weights.get(token, 0), weight)
+        for token, weight in weights.items():
+            if token not in self._postings:
+                self._postings[token] = {}
+                bisect.insort(self._tokens, token)
+            self._postings[token][item_id] = weight
+        self._documents[item_id] = list(weights)
+
+    def _remove(self, item_id):
+        for token in self._documents.pop(item_id, []):
+            self._postings.get(token, {}).pop(item_id, None)
+
+    def _load(self):
+        rows = db.session.query(
+            LostFoundItem.id, LostFoundItem.name, LostFoundItem.location, LostFoundItem.description
+        ).yield_per(1000)
+        for row in rows:
+            self._add(row.id, {'name': row.name, 'location': row.location, 'description': row.description})
+        self._loaded = True
+
+    def match(self, term):
+        """Return (filter criterion, rank expression) for a search term"""
+        tokens = tokenize(term)
+        if not tokens:
+            return None, None
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            scores = None
+            for token in tokens:
+                matched = {}
+                position = bisect.bisect_left(self._tokens, token)
+                while position < len(self._tokens) and self._tokens[position].startswith(token):
+                    for item_id, weight in self._postings[self._tokens[position]].items():
+                        matched[item_id] = max(matched.get(item_id, 0), weight)
+                    position += 1
+                if scores is None:
+                    scores = matched
+                else:
+                    scores = {item_id: scores[item_id] + weight
+                              for item_id, weight in matched.items() if item_id in scores}
+        if not scores:
+            return db.false(), None
+        rank = db.case(scores, value=LostFoundItem.id, else_=0)
+        return LostFoundItem.id.in_(list(scores)), rank
+
+    def on_commit(self, changed, deleted):
+        """Apply committed LostFoundItem changes to the index"""
+        with self._lock:
+            if not self._loaded:
+                return
+            for item_id in deleted:
+                self._remove(item_id)
+            for item_id, fields in changed.items():
+                self._remove(item_id)
+                self._add(item_id, fields)
+
+    def invalidate(self):
+        """Forget the index so the next search rebuilds it (after writes that bypass the ORM)"""
+        with self._lock:
+            self._postings, self._tokens, self._documents = {}, [], {}
+            self._loaded = False
+
+
+SEARCH_BACKENDS = {
+    'postgres': PostgresSearchBackend,
+    'memory': MemorySearchBackend,
+}
+
+search_backend = SEARCH_BACKENDS[os.getenv('SEARCH_BACKEND', 'postgres')]()
+
+
+@db.event.listens_for(db.session, 'after_flush')
+def track_search_changes(session, flush_context):
+    """Remember flushed LostFoundItem changes until the transaction commits"""
+    pending = session.info.setdefault('search_changes', ({}, set()))
+    changed, deleted = pending
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, LostFoundItem):
+            changed[obj.id] = {'name': obj.name, 'location': obj.location, 'description': obj.description}
+            deleted.discard(obj.id)
+    for obj in session.deleted:
+        if isinstance(obj, LostFoundItem):
+            changed.pop(obj.id, None)
+            deleted.add(obj.id)
+
+
+@db.event.listens_for(db.session, 'after_commit')
+def apply_search_changes(session):
+    """Push committed LostFoundItem changes to the search backend"""
+    changed, deleted = session.info.pop('search_changes', ({}, set()))
+    if changed or deleted:
+        search_backend.on_commit(changed, deleted)
+
+
+@db.event.listens_for(db.session, 'after_rollback')
+def discard_search_changes(session):
+    """Forget LostFoundItem changes that were rolled back"""
+    session.info.pop('search_changes', None)
+
+
+# Autocomplete
+# Completions for item names and report locations, served from sorted in-memory prefix
+# indexes. Each worker keeps its own copy: its own writes are applied as they commit,
+# and other workers' writes are picked up by a background reload every
+# AUTOCOMPLETE_REFRESH_SECONDS.
+AUTOCOMPLETE_REFRESH_SECONDS = int(os.getenv('AUTOCOMPLETE_REFRESH_SECONDS', '300'))
+AUTOCOMPLETE_LIMIT = 10
+AUTOCOMPLETE_MAX_LIMIT = 20
+AUTOCOMPLETE_CACHE_SIZE = 1024
+
+
+class PrefixIndex:
+    """Values searchable by the start of any of their words, ranked by how often they are used
+
+    Every word start of every value is kept as a (lowercase suffix, value) pair in
+    one sorted list, so the completions for a prefix are a contiguous slice found
+    with bisect.
+    """
+
+    def __init__(self, counts=(), keep_unused=False):
+        self.keep_unused = keep_unused
+        self._counts = dict(counts)  # value -> uses
+        self._keys = sorted(key for value in self._counts for key in self._entries(value))
+
+    @staticmethod
+    def _entries(value):
+        lowered = value.lower()
+        return [(lowered[match.start():], value) for match in SEARCH_TOKEN_RE.finditer(lowered)]
+
+    def __len__(self):
+        return len(self._counts)
+
+    def rename(self, value, new_value):
+        """Move value's uses over to new_value"""
+        if value not in self._counts or not new_value or new_value == value:
+            return
+        amount = self._counts[value]
+        self.discard(value)
+        self.add(new_value, amount)
+
+    def add(self, value, amount=1):
+        """Count amount more uses of value, inserting it if it is new"""
+        if not value:
+            return
+        if value not in self._counts:
+            self._counts[value] = 0
+            for key in self._entries(value):
+                bisect.insort(self._keys, key)
+        self._counts[value] += amount
+
+    def discard(self, value, amount=None):
+        """Count fewer uses of value; it is dropped once unused (unless keep_unused), or at once if amount is None"""
+        if value not in self._counts:
+            return
+        self._counts[value] = max(0, self._counts[value] - (amount or 0))
+        if amount is None or (self._counts[value] == 0 and not self.keep_unused):
+            del self._counts[value]
+            for key in self._entries(value):
+                position = bisect.bisect_left(self._keys, key)
+                if position < len(self._keys) and self._keys[position] == key:
+                    del self._keys[position]
+
+    def complete(self, prefix, limit):
+        """The most used values with a word starting with prefix, ties in alphabetical order"""
+        position = bisect.bisect_left(self._keys, (prefix,))
+        matches = set()
+        while position < len(self._keys) and self._keys[position][0].startswith(prefix):
+            matches.add(self._keys[position][1])
+            position += 1
+        return heapq.nsmallest(limit, matches, key=lambda value: (-self._counts[value], value.lower()))
+
+
+class AutocompleteIndex:
+    """Prefix indexes over item names (ranked by report count) and report locations (by use)"""
+    FIELDS = ('item', 'location')
+
+    def __init__(self):
+        self._indexes = None
+        self._loaded_at = 0
+        self._reloading = False
+        self._pending = None  # [(table versions, changes)] committed while a reload is running
+        self._cache = OrderedDict()  # (field, prefix, limit) -> completions
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+
+    def _build(self):
+        """Read the counts and the table versions they reflect from one snapshot of the primary"""
+        with db.engine.connect() as connection:
+            connection.execution_options(isolation_level='REPEATABLE READ')
+            versions = dict(connection.execute(
+                db.select(StatCounter.bucket, StatCounter.value)
+                .where(StatCounter.metric == 'table_version',
+                       StatCounter.bucket.in_([Item.__tablename__, LostFoundItem.__tablename__]))
+            ).all())
+            item_counts = connection.execute(
+                db.select(Item.name, db.func.count(LostFoundItem.id))
+                .outerjoin(LostFoundItem, LostFoundItem.item_id == Item.id)
+                .group_by(Item.id, Item.name)
+            ).all()
+            location_counts = connection.execute(
+                db.select(LostFoundItem.location, db.func.count()).group_by(LostFoundItem.location)
+            ).all()
+        indexes = {'item': PrefixIndex(item_counts, keep_unused=True), 'location': PrefixIndex(location_counts)}
+        return indexes, versions
+
+    @staticmethod
+    def _seen_by(snapshot_versions, versions):
+        """Whether a commit that wrote these table versions is already part of the snapshot"""
+        return any(snapshot_versions.get(table, 0) >= version for table, version in versions.items())
+
+    def _load(self):
+        with self._lock:
+            self._pending = []
+        try:
+            indexes, snapshot_versions = self._build()
+        except Exception:
+            with self._lock:
+                self._pending = None
+            raise
+        with self._lock:
+            # Commits that landed before the snapshot are already counted in it
+            for versions, changes in self._pending:
+                if not self._seen_by(snapshot_versions, versions):
+                    for field, value, amount in changes:
+                        self._apply(indexes, field, value, amount)
+            self._indexes, self._pending = indexes, None
+            self._loaded_at = time.monotonic()
+            self._cache.clear()
+
+    def _reload_in_background(self):
+        try:
+            with app.app_context():
+                self._load()
+        except Exception as e:
+            app.logger.error(f'Autocomplete reload failed: {str(e)}')
+        finally:
+            self._reloading = False
+
+    def complete(self, field, prefix, limit=AUTOCOMPLETE_LIMIT):
+        """Return up to limit completions of prefix for a field"""
+        if self._indexes is None:
+            with self._load_lock:
+                if self._indexes is None:
+                    self._load()
+        elif not self._reloading and time.monotonic() - self._loaded_at > AUTOCOMPLETE_REFRESH_SECONDS:
+            self._reloading = True
+            threading.Thread(target=self._reload_in_background, daemon=True).start()
+
+        prefix = prefix.strip().lower()
+        cache_key = (field, prefix, limit)
+        with self._lock:
+            if cache_key in self._cache:
+                self._cache.move_to_end(cache_key)
+                return self._cache[cache_key]
+            completions = self._indexes[field].complete(prefix, limit)
+            self._cache[cache_key] = completions
+            if len(self._cache) > AUTOCOMPLETE_CACHE_SIZE:
+                self._cache.popitem(last=False)
+            return completions
+
+    @staticmethod
+    def _apply(indexes, field, value, amount):
+        if isinstance(amount, str):
+            indexes[field].rename(value, amount)
+        elif amount is None or amount < 0:
+            indexes[field].discard(value, None if amount is None else -amount)
+        else:
+            indexes[field].add(value, amount)
+
+    def on_commit(self, changes, versions=None):
+        """Apply committed [(field, value, amount)] changes made at the given {table: version}
+
+        amount None removes the value, and a string amount renames the value to it,
+        keeping its count.
+        """
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((versions or {}, changes))
+            if self._indexes is None:
+                return
+            for field, value, amount in changes:
+                self._apply(self._indexes, field, value, amount)
+            self._cache.clear()
+
+    def invalidate(self):
+        """Forget the indexes so the next lookup reloads them (after writes that bypass the ORM)"""
+        with self._lock:
+            self._indexes = None
+            self._cache.clear()
+
+
+autocomplete_index = AutocompleteIndex()
+
+
+@db.event.listens_for(db.session, 'after_flush')
+def track_autocomplete_changes(session, flush_context):
+    """Remember flushed item names and report locations until the transaction commits"""
+    changes = session.info.setdefault('autocomplete_changes', [])
+    for obj in session.new:
+        if isinstance(obj, Item):
+            changes.append(('item', obj.name, 0))
+        elif isinstance(obj, LostFoundItem):
+            changes += [('item', obj.name, 1), ('location', obj.location, 1)]
+    for obj in session.dirty:
+        if isinstance(obj, Item):
+            history = db.inspect(obj).attrs.name.history
+            if history.deleted:
+                changes.append(('item', history.deleted[0], obj.name))
+        elif isinstance(obj, LostFoundItem):
+            history = db.inspect(obj).attrs.location.history
+            if history.deleted:
+                changes += [('location', history.deleted[0], -1), ('location', obj.location, 1)]
+    for obj in session.deleted:
+        if isinstance(obj, Item):
+            changes.append(('item', obj.name, None))
+        elif isinstance(obj, LostFoundItem):
+            changes += [('item', obj.name, -1), ('location', obj.location, -1)]
+
+
+@db.event.listens_for(db.session, 'after_commit')
+def apply_autocomplete_changes(session):
+    """Push committed changes to this worker's autocomplete indexes"""
+    changes = session.info.pop('autocomplete_changes', None)
+    versions = session.info.pop('table_versions', None)
+    if changes:
+        autocomplete_index.on_commit(changes, versions)
+
+
+@db.event.listens_for(db.session, 'after_rollback')
+def discard_autocomplete_changes(session):
+    """Forget changes that were rolled back"""
+    session.info.pop('autocomplete_changes', None)
+    session.info.pop('table_versions', None)
+
+
+# Sort key and direction for each sort option; id breaks ties so keyset pages are stable
+SEARCH_SORTS = {
+    'date-desc': (LostFoundItem.date, True),
+    'date-asc': (LostFoundItem.date, False),
+    'name-asc': (LostFoundItem.name, False),
+    'name-desc': (LostFoundItem.name, True),
+    'category': (LostFoundItem.category, False),
+    'status': (LostFoundItem.status, False),
+}
+
+SEARCH_PAGE_SIZE = 24
+SEARCH_MAX_PAGE_SIZE = 100
+
+search_cursor_serializer = URLSafeSerializer(app.config['SECRET_KEY'], salt='search-cursor')
+
+
+class InvalidCursor(ValueError):
+    """Raised when a search pagination cursor cannot be used"""
+
+
+def encode_search_cursor(sort_by, value, row_id):
+    """Sign the keyset position of a page's last row into an opaque cursor"""
+    if isinstance(value, date):
+        value = value.isoformat()
+    return search_cursor_serializer.dumps({'sort': sort_by, 'value': value, 'id': row_id})
+
+
+def decode_search_cursor(cursor, sort_by):
+    """Return the (sort value, id) a cursor continues after, for a search sorted by sort_by"""
+    try:
+        position = search_cursor_serializer.loads(cursor)
+    except BadSignature:
+        raise InvalidCursor('Invalid cursor')
+    if position.get('sort') != sort_by:
+        raise InvalidCursor('Cursor does not match the requested sort')
+    value = position['value']
+    if sort_by in SEARCH_SORTS and SEARCH_SORTS[sort_by][0] is LostFoundItem.date:
+        value = datetime.strptime(value, '%Y-%m-%d').date()
+    return value, position['id']
+
+
+def search_filters_from_args(args):
+    """Read the search filters shared by /search and /api/search from the query string"""
+    return {
+        'q': args.get('q', '').strip(),
+        'category': args.get('category', ''),
+        'status': args.get('status', ''),
+        'date_from': args.get('date_from', ''),
+        'date_to': args.get('date_to', ''),
+        'location': args.get('location', '').strip(),
+        'sort': args.get('sort', ''),
+    }
+
+
+def search_limit_from_args(args):
+    """Read the page size from the query string, clamped to SEARCH_MAX_PAGE_SIZE"""
+    limit = args.get('limit', SEARCH_PAGE_SIZE, type=int)
+    return max(1, min(limit, SEARCH_MAX_PAGE_SIZE))
+
+
+def build_search_query(filters):
+    """Build the ordered LostFoundItem query for a set of search filters
+
+    Returns (query, sort name, sort key, descending) so callers can continue
+    the query after a given row.
+    """
+    query = LostFoundItem.query
+    rank = None
+
+    if filters['q']:
+        criterion, rank = search_backend.match(filters['q'])
+        if criterion is not None:
+            query = query.filter(criterion)
+
+    if filters['category']:
+        query = query.filter(LostFoundItem.category == filters['category'])
+
+    if filters['status']:
+        query = query.filter(LostFoundItem.status == filters['status'])
+
+    if filters['date_from']:
+        query = query.filter(LostFoundItem.date >= datetime.strptime(filters['date_from'], '%Y-%m-%d').date())
+
+    if filters['date_to']:
+        query = query.filter(LostFoundItem.date <= datetime.strptime(filters['date_to'], '%Y-%m-%d').date())
+
+    if filters['location']:
+        query = query.filter(LostFoundItem.location.ilike(f"%{filters['location']}%"))
+
+    # Ranked results by default when searching, newest first otherwise
+    sort_by = filters['sort'] or ('relevance' if rank is not None else 'date-desc')
+    if sort_by == 'relevance' and rank is not None:
+        sort_key, descending = rank, True
+    elif sort_by in SEARCH_SORTS:
+        sort_key, descending = SEARCH_SORTS[sort_by]
+    else:
+        sort_by = 'date-desc'
+        sort_key, descending = SEARCH_SORTS[sort_by]
+
+    if descending:
+        query = query.order_by(sort_key.desc(), LostFoundItem.id.desc())
+    else:
+        query = query.order_by(sort_key.asc(), LostFoundItem.id.asc())
+
+    return query, sort_by, sort_key, descending
+
+
+# Fields clients can request with fields=, in response order
+LOST_FOUND_ITEM_FIELDS = ('id', 'item_id', 'name', 'category', 'status', 'date', 'location', 'description',
+                          'contact', 'phone', 'student_id', 'program', 'department')
+ITEM_FIELDS = ('id', 'name', 'category', 'date', 'description', 'color', 'brand', 'value')
+
+
+def fields_from_args(args, allowed):
+    """Read the fields= projection from the query string, raising ValueError for unknown fields"""
+    requested = [field.strip() for field in args.get('fields', '').split(',') if field.strip()]
+    if not requested:
+        return allowed
+    unknown = [field for field in requested if field not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+    return tuple(dict.fromkeys(requested))
+
+
+def columns_for(model, fields):
+    """Table columns for a projection, so only those are SELECTed"""
+    return [model.__table__.c[field] for field in fields]
+
+
+def serialize_row(row, fields):
+    """Convert a projected result row into a JSON-serializable dict"""
+    data = {}
+    for field in fields:
+        value = getattr(row, field)
+        data[field] = value.isoformat() if isinstance(value, date) else value
+    return data
+
+
+def search_page(filters, limit, cursor=None, fields=LOST_FOUND_ITEM_FIELDS):
+    """Return (rows as dicts, next_cursor) for one keyset page of search results
+
+    Only the requested fields (plus the keyset columns) are selected.
+    """
+    query, sort_by, sort_key, descending = build_search_query(filters)
+
+    if cursor:
+        row_key = db.tuple_(sort_key, LostFoundItem.id)
+        after = db.tuple_(*decode_search_cursor(cursor, sort_by))
+        query = query.filter(row_key < after if descending else row_key > after)
+
+    # Fetch one extra row to know whether another page exists
+    query = query.with_entities(
+        *columns_for(LostFoundItem, fields),
+        LostFoundItem.id.label('keyset_id'),
+        sort_key.label('keyset_value')
+    )
+    rows = query.limit(limit + 1).all()
+    items = [serialize_row(row, fields) for row in rows[:limit]]
+
+    next_cursor = None
+    if len(rows) > limit:
+        last_row = rows[limit - 1]
+        next_cursor = encode_search_cursor(sort_by, last_row.keyset_value, last_row.keyset_id)
+
+    return items, next_cursor
+
+
+# Statistics counters
+# Metrics that are bucketed by ISO date, so a date range is a range scan on the primary key
+DAILY_METRICS = ('items_by_day', 'reports_by_day:lost', 'reports_by_day:found')
+
+
+def stat_counter_keys(model, values):
+    """Return the (metric, bucket) counters that one row of a model contributes to"""
+    if model is Item:
+        return [('items', ''), ('items_by_day', values['date'].isoformat())]
+    if model is LostFoundItem:
+        return [
+            ('reports', ''),
+            ('reports_by_status', values['status']),
+            ('reports_by_category', values['category']),
+            (f"reports_by_day:{values['status']}", values['date'].isoformat()),
+        ]
+    if model is User:
+        return [('users', '')]
+    return []
+
+
+STAT_COUNTER_FIELDS = {
+    Item: ('date',),
+    LostFoundItem: ('status', 'category', 'date'),
+    User: (),
+}
+
+
+def stat_counter_deltas(session):
+    """Work out how the pending inserts, updates and deletes change each counter"""
+    deltas = {}
+
+    def apply(model, values, amount):
+        for key in stat_counter_keys(model, values):
+            deltas[key] = deltas.get(key, 0) + amount
+
+    for obj in session.new:
+        model = type(obj)
+        if model in STAT_COUNTER_FIELDS:
+            apply(model, {field: getattr(obj, field) for field in STAT_COUNTER_FIELDS[model]}, 1)
+
+    for obj in session.deleted:
+        model = type(obj)
+        if model in STAT_COUNTER_FIELDS:
+            apply(model, {field: getattr(obj, field) for field in STAT_COUNTER_FIELDS[model]}, -1)
+
+    for obj in session.dirty:
+        model = type(obj)
+        if not STAT_COUNTER_FIELDS.get(model):
+            continue
+        state = db.inspect(obj)
+        old_values, new_values = {}, {}
+        for field in STAT_COUNTER_FIELDS[model]:
+            history = state.attrs[field].history
+            new_values[field] = getattr(obj, field)
+            old_values[field] = history.deleted[0] if history.deleted else new_values[field]
+        if old_values != new_values:
+            apply(model, old_values, -1)
+            apply(model, new_values, 1)
+
+    return {key: amount for key, amount in deltas.items() if amount}
+
+
+@db.event.listens_for(db.session, 'after_flush')
+def update_stat_counters(session, flush_context):
+    """Apply counter changes in the same transaction as the rows they count
+
+    The new table versions are kept in session.info until the transaction ends;
+    the autocomplete index uses them to tell whether a reload already saw the write.
+    """
+    apply_stat_counter_deltas(session.connection(), stat_counter_deltas(session))
+    touched = {type(obj).__table__.name for obj in list(session.new) + list(session.dirty) + list(session.deleted)
+               if type(obj) in STAT_COUNTER_FIELDS}
+    session.info.setdefault('table_versions', {}).update(bump_table_versions(session.connection(), touched))
+
+
+def bump_table_versions(connection, tables):
+    """Advance the version of each written table to max(version + 1, now in milliseconds)
+
+    The version changes on every write (including deletes), so it serves as an
+    ETag, and it doubles as the table's last-modified time. The version row stays
+    locked until the transaction ends, so versions follow commit order. Returns
+    {table: new version}.
+    """
+    if not tables:
+        return {}
+    now_ms = int(time.time() * 1000)
+    statement = postgresql.insert(StatCounter.__table__).values(
+        [{'metric': 'table_version', 'bucket': table, 'value': now_ms} for table in sorted(tables)]
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=['metric', 'bucket'],
+        set_={'value': db.func.greatest(StatCounter.__table__.c.value + 1, statement.excluded.value)}
+    ).returning(StatCounter.__table__.c.bucket, StatCounter.__table__.c.value)
+    return dict(connection.execute(statement).all())
+
+
+def table_version(table):
+    """Return the current version of a table (0 if it has never been written through the app)"""
+    with primary_reads():
+        counter = db.session.get(StatCounter, ('table_version', table))
+    return counter.value if counter else 0
+
+
+def apply_stat_counter_deltas(connection, deltas):
+    """Add {(metric, bucket): amount} to the counters on the given connection"""
+    if not deltas:
+        return
+    # Sorted so concurrent transactions lock counter rows in the same order
+    rows = [{'metric': metric, 'bucket': bucket, 'value': amount}
+            for (metric, bucket), amount in sorted(deltas.items())]
+    statement = postgresql.insert(StatCounter.__table__).values(rows)
+    statement = statement.on_conflict_do_update(
+        index_elements=['metric', 'bucket'],
+        set_={'value': StatCounter.__table__.c.value + statement.excluded.value}
+    )
+    connection.execute(statement)
+
+
+def rebuild_stat_counters():
+    """Recompute every counter from the underlying tables"""
+    # Table versions must never go backwards, so they are kept
+    StatCounter.query.filter(StatCounter.metric != 'table_version').delete()
+    counters = {('items', ''): Item.query.count(), ('users', ''): User.query.count(),
+                ('reports', ''): LostFoundItem.query.count()}
+
+    for day, count in db.session.query(Item.date, db.func.count()).group_by(Item.date):
+        counters[('items_by_day', day.isoformat())] = count
+
+    for status, category, day, count in db.session.query(
+        LostFoundItem.status, LostFoundItem.category, LostFoundItem.date, db.func.count()
+    ).group_by(LostFoundItem.status, LostFoundItem.category, LostFoundItem.date):
+        for key in stat_counter_keys(LostFoundItem, {'status': status, 'category': category, 'date': day})[1:]:
+            counters[key] = counters.get(key, 0) + count
+
+    db.session.add_all(StatCounter(metric=metric, bucket=bucket, value=value)
+                       for (metric, bucket), value in counters.items() if value)
+    db.session.commit()
+
+
+def get_stats():
+    """Read the dashboard and about page statistics with a single counter lookup"""
+    today = datetime.now().date()
+    seven_days_ago = today - timedelta(days=7)
+    tomorrow = today + timedelta(days=1)
+
+    counters = StatCounter.query.filter(
+        db.or_(
+            StatCounter.metric.in_(['items', 'reports', 'users', 'reports_by_status', 'reports_by_category']),
+            db.and_(StatCounter.metric.in_(DAILY_METRICS),
+                    StatCounter.bucket >= seven_days_ago.isoformat(), StatCounter.bucket < tomorrow.isoformat())
+        )
+    ).all()
+    values = {(counter.metric, counter.bucket): counter.value for counter in counters}
+
+    def weekly(metric):
+        return sum(value for (name, bucket), value in values.items() if name == metric)
+
+    categories = sorted(
+        ((bucket, value) for (name, bucket), value in values.items() if name == 'reports_by_category' and value),
+        key=lambda category: category[1], reverse=True
+    )
+
+    return {
+        'total_items': values.get(('items', ''), 0),
+        'total_lost_found': values.get(('reports', ''), 0),
+        'total_users': values.get(('users', ''), 0),
+        'lost_items': values.get(('reports_by_status', 'lost'), 0),
+        'found_items': values.get(('reports_by_status', 'found'), 0),
+        'today_items': values.get(('items_by_day', today.isoformat()), 0),
+        'today_lost': values.get(('reports_by_day:lost', today.isoformat()), 0),
+        'today_found': values.get(('reports_by_day:found', today.isoformat()), 0),
+        'weekly_lost': weekly('reports_by_day:lost'),
+        'weekly_found': weekly('reports_by_day:found'),
+        'category_counts': categories,
+    }
+
+
+# Response cache
+class MemoryCacheBackend:
+    """Per-process LRU cache with a TTL on every entry"""
+    name = 'memory'
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisCacheBackend:
+    """Cache shared by all gunicorn workers through a Redis-compatible server
+
+    Entries are namespaced by a generation number, so clearing the cache is a
+    single INCR that every worker sees immediately.
+    """
+    name = 'redis'
+
+    def __init__(self, url, prefix='lost_found:cache:'):
+        import redis
+        self._client = redis.Redis.from_url(url)
+        self._prefix = prefix
+
+    def _key(self, key):
+        generation = int(self._client.get(f'{self._prefix}generation') or 0)
+        return f'{self._prefix}{generation}:{key}'
+
+    def get(self, key):
+        raw = self._client.get(self._key(key))
+        return pickle.loads(raw) if raw is not None else None
+
+    def set(self, key, value, ttl):
+        self._client.setex(self._key(key), ttl, pickle.dumps(value))
+
+    def clear(self):
+        self._client.incr(f'{self._prefix}generation')
+
+
+class ResponseCache:
+    """Caches the database results of read-heavy views until the next write commits"""
+
+    def __init__(self, backend, ttl):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for key, computing and storing it on a miss"""
+        try:
+            value = None if has_request_context() and g.get('skip_cache_read') else self.backend.get(key)
+        except Exception as e:
+            app.logger.warning(f'Cache read failed: {str(e)}')
+            value = None
+        if value is not None:
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        # Every user is served what is stored here, so it is computed on the primary
+        with primary_reads():
+            value = compute()
+        try:
+            self.backend.set(key, value, self.ttl)
+        except Exception as e:
+            app.logger.warning(f'Cache write failed: {str(e)}')
+        return value
+
+    def invalidate(self):
+        """Drop every cached entry"""
+        self.invalidations += 1
+        try:
+            self.backend.clear()
+        except Exception as e:
+            app.logger.warning(f'Cache invalidation failed: {str(e)}')
+
+    def stats(self):
+        """Hit/miss counts for this worker"""
+        lookups = self.hits + self.misses
+        return {
+            'backend': self.backend.name,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+            'invalidations': self.invalidations,
+            'ttl': self.ttl,
+        }
+
+
+def create_cache_backend():
+    """Use Redis when CACHE_REDIS_URL is set, otherwise a per-process LRU"""
+    redis_url = os.getenv('CACHE_REDIS_URL')
+    if redis_url:
+        try:
+            return RedisCacheBackend(redis_url)
+        except ImportError:
+            app.logger.warning('CACHE_REDIS_URL is set but the redis package is not installed; using memory cache')
+    return MemoryCacheBackend(int(os.getenv('CACHE_MAX_ENTRIES', '256')))
+
+
+response_cache = ResponseCache(
+    create_cache_backend() if env_bool('CACHE_ENABLED', True) else MemoryCacheBackend(0),
+    int(os.getenv('CACHE_TTL', '60'))
+)
+
+
+def cache_key(is_admin):
+    """Build the cache key for the current request: route + query args + admin flag"""
+    args = '&'.join(f'{key}={value}' for key, value in sorted(request.args.items(multi=True)))
+    return f"{request.endpoint}?{args}|admin={int(bool(is_admin))}"
+
+
+def model_to_dict(obj):
+    """Copy a model's column values into a plain dict (templates read it like the model)"""
+    return {attr.key: getattr(obj, attr.key) for attr in db.inspect(obj).mapper.column_attrs}
+
+
+@db.event.listens_for(db.session, 'after_flush')
+def mark_cache_stale(session, flush_context):
+    """Remember that this transaction wrote rows"""
+    session.info['cache_stale'] = True
+
+
+@db.event.listens_for(db.session, 'do_orm_execute')
+def mark_cache_stale_bulk(orm_execute_state):
+    """Bulk UPDATE/DELETE statements bypass the flush, so catch them here"""
+    if orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert:
+        orm_execute_state.session.info['cache_stale'] = True
+
+
+@db.event.listens_for(db.session, 'after_commit')
+def invalidate_response_cache(session):
+    """Invalidate cached view data once a write has committed"""
+    if session.info.pop('cache_stale', False):
+        response_cache.invalidate()
+
+
+@db.event.listens_for(db.session, 'after_rollback')
+def discard_cache_stale(session):
+    """Rolled back writes leave the cache valid"""
+    session.info.pop('cache_stale', None)
+
+
+# Matching
+MATCH_WINDOW_DAYS = 14  # candidates must be reported within this many days of each other
+MATCH_MAX_CANDIDATES = 200  # nearest-by-date candidates scored per report
+MATCH_MIN_SCORE = 0.35
+MATCH_MAX_RESULTS = 10
+MATCH_WEIGHTS = {'name': 0.4, 'date': 0.2, 'location': 0.2, 'description': 0.2}
+
+
+def token_similarity(a, b):
+    """Jaccard similarity of the search tokens of two strings"""
+    tokens_a, tokens_b = set(tokenize(a)), set(tokenize(b))
+    if not tokens_a or not tokens_b:
+        return 0.0
+    return len(tokens_a & tokens_b) / len(tokens_a | tokens_b)
+
+
+def score_match(report, candidate):
+    """Score how likely two reports of opposite status describe the same item (0..1)"""
+    if report.name == candidate.name:
+        name_score = 1.0
+    else:
+        name_score = token_similarity(report.name, candidate.name)
+    days_apart = abs((report.date - candidate.date).days)
+    scores = {
+        'name': name_score,
+        'date': max(0.0, 1 - days_apart / (MATCH_WINDOW_DAYS + 1)),
+        'location': token_similarity(report.location, candidate.location),
+        'description': token_similarity(report.description, candidate.description),
+    }
+    return round(sum(MATCH_WEIGHTS[key] * value for key, value in scores.items()), 4)
+
+
+def match_candidates(report):
+    """Fetch the reports of the opposite status that share the report's blocking key
+
+    The block is the same category within MATCH_WINDOW_DAYS. Candidates are
+    read outward from the report's date along the (category, status, date)
+    index, so at most MATCH_MAX_CANDIDATES rows are read however big the
+    table is.
+    """
+    opposite = 'found' if report.status == 'lost' else 'lost'
+    window = timedelta(days=MATCH_WINDOW_DAYS)
+    columns = (LostFoundItem.id, LostFoundItem.name, LostFoundItem.date,
+               LostFoundItem.location, LostFoundItem.description)
+    block = (LostFoundItem.category == report.category, LostFoundItem.status == opposite)
+    half = MATCH_MAX_CANDIDATES // 2
+
+    later = db.select(*columns).where(
+        *block, LostFoundItem.date >= report.date, LostFoundItem.date <= report.date + window
+    ).order_by(LostFoundItem.date.asc()).limit(half)
+    earlier = db.select(*columns).where(
+        *block, LostFoundItem.date < report.date, LostFoundItem.date >= report.date - window
+    ).order_by(LostFoundItem.date.desc()).limit(half)
+
+    return db.session.execute(db.union_all(later.subquery().select(), earlier.subquery().select())).all()
+
+
+def find_matches(report):
+    """Return [(candidate id, score)] for the best matches of one report, best first"""
+    scored = [(candidate.id, score_match(report, candidate)) for candidate in match_candidates(report)]
+    scored = [(candidate_id, score) for candidate_id, score in scored if score >= MATCH_MIN_SCORE]
+    scored.sort(key=lambda match: match[1], reverse=True)
+    return scored[:MATCH_MAX_RESULTS]
+
+
+def record_matches(report, raise_errors=False):
+    """Score a newly committed report and store its matches; returns how many were found
+
+    Only the new report is scored, so the cost does not depend on table size.
+    Pairs that are already stored are skipped, so a task re-run after a worker
+    died mid-way does not trip the unique constraint.
+    Failures are logged rather than raised - the report itself is already saved -
+    unless raise_errors is set, so a background task can be retried.
+    """
+    try:
+        matches = find_matches(report)
+        rows = []
+        for candidate_id, score in matches:
+            if report.status == 'lost':
+                rows.append({'lost_id': report.id, 'found_id': candidate_id, 'score': score})
+            else:
+                rows.append({'lost_id': candidate_id, 'found_id': report.id, 'score': score})
+        if rows:
+            db.session.execute(
+                postgresql.insert(ReportMatch).values(rows)
+                .on_conflict_do_nothing(index_elements=['lost_id', 'found_id'])
+            )
+        db.session.commit()
+        return len(matches)
+    except Exception as e:
+        db.session.rollback()
+        if raise_errors:
+            raise
+        app.logger.error(f'Error matching report {report.id}: {str(e)}')
+        return 0
+
+
+# Live feed
+FEED_CHANNEL = 'lost_found_feed'
+FEED_FIELDS = ('id', 'name', 'category', 'date', 'location', 'contact', 'phone', 'status')
+FEED_QUEUE_SIZE = 100  # events buffered per subscriber before it is dropped as too slow
+FEED_BACKLOG = 50  # recent events kept for clients reconnecting with Last-Event-ID
+FEED_HEARTBEAT_SECONDS = int(os.getenv('FEED_HEARTBEAT_SECONDS', '15'))
+
+
+class ReportFeed:
+    """In-process fan-out of newly committed reports to live-feed subscribers
+
+    Each subscriber gets its own bounded queue; publishing never touches the
+    database, so idle subscribers cost nothing but a parked connection.
+    """
+
+    def __init__(self):
+        self._subscribers = set()
+        self._backlog = deque(maxlen=FEED_BACKLOG)
+        self._lock = threading.Lock()
+
+    def subscribe(self, last_event_id=None):
+        """Register a subscriber, pre-filled with any events it missed since last_event_id"""
+        subscriber = queue.Queue(maxsize=FEED_QUEUE_SIZE)
+        with self._lock:
+            if last_event_id is not None:
+                for event in self._backlog:
+                    if event['id'] > last_event_id:
+                        subscriber.put_nowait(event)
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def publish(self, events):
+        """Deliver events to every subscriber, dropping any whose queue is full"""
+        with self._lock:
+            self._backlog.extend(events)
+            for subscriber in list(self._subscribers):
+                try:
+                    for event in events:
+                        subscriber.put_nowait(event)
+                except queue.Full:
+                    # Too slow to keep up: close its stream, the browser reconnects with Last-Event-ID
+                    self._subscribers.discard(subscriber)
+                    with subscriber.mutex:
+                        subscriber.queue.clear()
+                    subscriber.put_nowait(None)
+
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+
+class MemoryFeedBroker:
+    """Publishes committed reports to subscribers in this process only"""
+    name = 'memory'
+
+    def __init__(self, feed):
+        self.feed = feed
+
+    def on_flush(self, connection, events):
+        pass
+
+    def on_commit(self, events):
+        self.feed.publish(events)
+
+    def start(self):
+        pass
+
+
+def listen_connection(channel):
+    """Open a connection LISTENing on channel; it is kept out of the pool for the listener's life"""
+    engine = db.engines['listen'] if LISTEN_DATABASE_URL else db.engine
+    connection = engine.raw_connection()
+    connection.detach()
+    dbapi_connection = connection.dbapi_connection
+    try:
+        dbapi_connection.autocommit = True
+        dbapi_connection.cursor().execute(f'LISTEN {channel}')
+    except Exception:
+        dbapi_connection.close()
+        raise
+    return dbapi_connection
+
+
+class PostgresFeedBroker:
+    """Publishes through Postgres LISTEN/NOTIFY so every gunicorn worker sees every report
+
+    NOTIFY is sent inside the writing transaction, so Postgres delivers it only
+    if the transaction commits. Each worker holds one listening connection and
+    fans the notifications out to its own subscribers.
+    """
+    name = 'postgres'
+
+    def __init__(self, feed):
+        self.feed = feed
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def on_flush(self, connection, events):
+        for event in events:
+            connection.execute(db.select(db.func.pg_notify(FEED_CHANNEL, json.dumps(event))))
+
+    def on_commit(self, events):
+        pass
+
+    def start(self):
+        """Start the listener thread on first use"""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._listen, name='feed-listener', daemon=True)
+                self._thread.start()
+
+    def _listen(self):
+        while True:
+            dbapi_connection = None
+            try:
+                with app.app_context():
+                    dbapi_connection = listen_connection(FEED_CHANNEL)
+                while True:
+                    if select.select([dbapi_connection], [], [], FEED_HEARTBEAT_SECONDS) == ([], [], []):
+                        continue
+                    dbapi_connection.poll()
+                    events = []
+                    while dbapi_connection.notifies:
+                        events.append(json.loads(dbapi_connection.notifies.pop(0).payload))
+                    if events:
+                        self.feed.publish(events)
+            except Exception as e:
+                app.logger.error(f'Live feed listener error: {str(e)}')
+                if dbapi_connection is not None:
+                    try:
+                        dbapi_connection.close()  # detached, so the pool will not close it
+                    except Exception:
+                        pass
+                time.sleep(5)
+
+
+FEED_BROKERS = {
+    'memory': MemoryFeedBroker,
+    'postgres': PostgresFeedBroker,
+}
+
+report_feed = ReportFeed()
+feed_broker = FEED_BROKERS[os.getenv('FEED_BACKEND', 'memory')](report_feed)
+
+
+@db.event.listens_for(db.session, 'after_flush')
+def track_new_reports(session, flush_context):
+    """Collect newly inserted reports for the live feed"""
+    events = [serialize_row(obj, FEED_FIELDS) for obj in session.new if isinstance(obj, LostFoundItem)]
+    if events:
+        events.sort(key=lambda event: event['id'])
+        feed_broker.on_flush(session.connection(), events)
+        session.info.setdefault('feed_events', []).extend(events)
+
+
+@db.event.listens_for(db.session, 'after_commit')
+def publish_new_reports(session):
+    """Publish committed reports to live-feed subscribers"""
+    events = session.info.pop('feed_events', None)
+    if events:
+        feed_broker.on_commit(events)
+
+
+@db.event.listens_for(db.session, 'after_rollback')
+def discard_new_reports(session):
+    """Rolled back reports never reach the feed"""
+    session.info.pop('feed_events', None)
+
+
+# Background tasks
+# Work that need not finish before the response is queued in background_task within the
+# request's own transaction, so it exists only if the request's writes commit. A
+# `flask run-worker` process claims due tasks with FOR UPDATE SKIP LOCKED and runs them
+# on a thread pool; NOTIFY wakes it as soon as a task is committed.
+TASK_CHANNEL = 'background_task'
+TASK_MAX_ATTEMPTS = 5
+TASK_RETRY_BASE_SECONDS = 10  # wait before the first retry; doubles with each further failure
+TASK_TIMEOUT_SECONDS = int(os.getenv('TASK_TIMEOUT_SECONDS', '300'))  # running longer means the worker died
+TASK_POLL_SECONDS = 5  # also when due retries are noticed
+TASK_RETENTION_HOURS = 24  # finished tasks are kept this long for the stats
+TASK_HANDLERS = {}
+
+TASK_CLAIM_SQL = """
+    UPDATE background_task SET status = 'running', attempts = attempts + 1, started_at = :now
+    WHERE id IN (
+        SELECT id FROM background_task
+        WHERE (status = 'queued' AND run_at <= :now) OR (status = 'running' AND started_at < :stale_before)
+        ORDER BY run_at
+        LIMIT :limit
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING id, kind, payload, attempts, created_at
+"""
+
+
+def background_tasks_enabled():
+    return env_bool('BACKGROUND_TASKS', False)
+
+
+def task(kind):
+    """Register a function as the handler for a kind of background task"""
+    def decorator(f):
+        TASK_HANDLERS[kind] = f
+        return f
+    return decorator
+
+
+def enqueue_task(kind, **payload):
+    """Queue a task in the current transaction; it becomes visible to workers when that commits"""
+    if kind not in TASK_HANDLERS:
+        raise ValueError(f"Unknown task kind '{kind}'")
+    db.session.add(BackgroundTask(kind=kind, payload=payload))
+    # Delivered by Postgres at commit, and dropped on rollback
+    db.session.execute(db.select(db.func.pg_notify(TASK_CHANNEL, kind)))
+
+
+def task_retry_delay(attempts):
+    """Seconds to wait before retrying a task that has failed attempts times
+
+    Doubles with each failure, with up to 50% random jitter so tasks that failed
+    together are not all retried at once.
+    """
+    return TASK_RETRY_BASE_SECONDS * 2 ** (attempts - 1) * random.uniform(1, 1.5)
+
+
+@task('match_report')
+def match_report_task(report_id):
+    report = db.session.get(LostFoundItem, report_id)
+    if report is not None:  # deleted since it was queued
+        record_matches(report, raise_errors=True)
+
+
+class TaskWorker:
+    """Runs queued background tasks on a pool of threads until the process is stopped"""
+
+    def __init__(self, threads=4):
+        self.threads = threads
+        self._slots = threading.BoundedSemaphore(threads)
+        self._executor = ThreadPoolExecutor(threads, thread_name_prefix='task')
+        self._purged_at = 0
+        self._listen_retry_at = 0
+        self._listen_retry_seconds = 1
+
+    def run(self):
+        listener = None
+        while True:
+            # Claim as many tasks as there are idle threads, waiting for at least one
+            self._slots.acquire()
+            free = 1
+            while free < self.threads and self._slots.acquire(blocking=False):
+                free += 1
+            try:
+                claimed = self._claim(free)
+            except Exception as e:
+                app.logger.error(f'Claiming background tasks failed: {str(e)}')
+                claimed = []
+            for _ in range(free - len(claimed)):
+                self._slots.release()
+            for row in claimed:
+                self._executor.submit(self._execute, row)
+            if not claimed:
+                listener = self._wait(listener)
+                try:
+                    self._purge()
+                except Exception as e:
+                    app.logger.error(f'Purging finished background tasks failed: {str(e)}')
+
+    def _wait(self, listener):
+        """Sleep until a task is queued or TASK_POLL_SECONDS pass; returns the listening connection
+
+        While the LISTEN connection is down (database restart, idle timeout) the worker
+        keeps polling every TASK_POLL_SECONDS and reconnects with exponential backoff.
+        """
+        if listener is None and time.monotonic() >= self._listen_retry_at:
+            try:
+                listener = listen_connection(TASK_CHANNEL)
+                self._listen_retry_seconds = 1
+            except Exception as e:
+                app.logger.error(f'Background task listener cannot connect, retrying in '
+                                 f'{self._listen_retry_seconds}s: {str(e)}')
+                self._listen_retry_at = time.monotonic() + self._listen_retry_seconds
+                self._listen_retry_seconds = min(self._listen_retry_seconds * 2, 60)
+        if listener is None:
+            time.sleep(TASK_POLL_SECONDS)
+            return None
+
+        try:
+            if select.select([listener], [], [], TASK_POLL_SECONDS) != ([], [], []):
+                listener.poll()
+                listener.notifies.clear()
+        except Exception as e:
+            app.logger.error(f'Background task listener lost its connection: {str(e)}')
+            try:
+                listener.close()
+            except Exception:
+                pass
+            return None
+        return listener
+
+    def _claim(self, limit):
+        now = datetime.utcnow()
+        with db.engine.begin() as connection:
+            return connection.execute(db.text(TASK_CLAIM_SQL), {
+                'now': now, 'stale_before': now - timedelta(seconds=TASK_TIMEOUT_SECONDS), 'limit': limit,
+            }).all()
+
+    def _finish(self, task_id, **values):
+        with db.engine.begin() as connection:
+            connection.execute(db.update(BackgroundTask).where(BackgroundTask.id == task_id).values(**values))
+
+    def _execute(self, row):
+        started = time.perf_counter()
+        try:
+            with app.app_context():
+                try:
+                    if row.attempts > TASK_MAX_ATTEMPTS:
+                        raise RuntimeError('Worker stopped while running the task too many times')
+                    TASK_HANDLERS[row.kind](**row.payload)
+                    self._finish(row.id, status='done', finished_at=datetime.utcnow(), last_error=None)
+                    app.logger.info(f'Task {row.id} ({row.kind}) done in {time.perf_counter() - started:.3f}s, '
+                                    f'{(datetime.utcnow() - row.created_at).total_seconds():.3f}s after it was queued')
+                except Exception as e:
+                    db.session.rollback()
+                    error = f'{e.__class__.__name__}: {str(e).splitlines()[0] if str(e) else ""}'
+                    if row.attempts >= TASK_MAX_ATTEMPTS:
+                        self._finish(row.id, status='failed', finished_at=datetime.utcnow(), last_error=error)
+                        app.logger.error(f'Task {row.id} ({row.kind}) failed for good: {error}')
+                    else:
+                        delay = task_retry_delay(row.attempts)
+                        self._finish(row.id, status='queued', last_error=error,
+                                     run_at=datetime.utcnow() + timedelta(seconds=delay))
+                        app.logger.warning(f'Task {row.id} ({row.kind}) failed, retrying in {delay:.0f}s: {error}')
+        except Exception as e:
+            app.logger.error(f'Recording the outcome of task {row.id} failed: {str(e)}')
+        finally:
+            self._slots.release()
+
+    def _purge(self):
+        """Delete finished tasks past TASK_RETENTION_HOURS, at most once an hour"""
+        if time.monotonic() - self._purged_at < 3600:
+            return
+        self._purged_at = time.monotonic()
+        with db.engine.begin() as connection:
+            connection.execute(db.delete(BackgroundTask).where(
+                BackgroundTask.status == 'done',
+                BackgroundTask.finished_at < datetime.utcnow() - timedelta(hours=TASK_RETENTION_HOURS)
+            ))
+
+
+def task_stats():
+    """Queue depth per status, the oldest due task and last hour's wait and run times"""
+    now = datetime.utcnow()
+    counts = dict(db.session.execute(
+        db.select(BackgroundTask.status, db.func.count()).group_by(BackgroundTask.status)
+    ).all())
+    oldest_due = db.session.execute(
+        db.select(db.func.min(BackgroundTask.run_at))
+        .where(BackgroundTask.status == 'queued', BackgroundTask.run_at <= now)
+    ).scalar()
+
+    wait = db.func.extract('epoch', BackgroundTask.started_at - BackgroundTask.created_at)
+    run = db.func.extract('epoch', BackgroundTask.finished_at - BackgroundTask.started_at)
+    percentiles = {f'{name}_{label}': db.func.percentile_cont(fraction).within_group(column)
+                   for name, column in (('wait', wait), ('run', run))
+                   for label, fraction in (('p50', 0.5), ('p95', 0.95))}
+    latency = db.session.execute(
+        db.select(*(expression.label(key) for key, expression in percentiles.items()))
+        .where(BackgroundTask.status == 'done', BackgroundTask.finished_at >= now - timedelta(hours=1))
+    ).one()._asdict()
+
+    return {
+        'queued': counts.get('queued', 0),
+        'running': counts.get('running', 0),
+        'failed': counts.get('failed', 0),
+        'done': counts.get('done', 0),
+        'oldest_due_seconds': round((now - oldest_due).total_seconds(), 3) if oldest_due else 0,
+        'last_hour_seconds': {key: round(value, 3) if value is not None else None for key, value in latency.items()},
+    }
+
+
+# Bulk import
+IMPORT_BATCH_SIZE = int(os.getenv('IMPORT_BATCH_SIZE', '5000'))
+IMPORT_MAX_ERRORS = 1000  # per-row errors listed in the report; the rest are only counted
+IMPORT_KINDS = ('items', 'reports')
+
+
+def iter_import_records(stream, data_format):
+    """Yield (row number, row dict, parse error) from a CSV or NDJSON text stream"""
+    if data_format == 'csv':
+        number = 0
+        try:
+            for number, row in enumerate(csv.DictReader(stream, strict=True), start=1):
+                yield number, row, None
+        except csv.Error as e:
+            # The reader cannot find the next row after malformed CSV (e.g. an unterminated quote)
+            yield number + 1, None, f'Invalid CSV, rest of the file skipped: {str(e)}'
+        return
+
+    for number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield number, None, f'Invalid JSON: {str(e)}'
+            continue
+        if not isinstance(row, dict):
+            yield number, None, 'Each line must be a JSON object'
+            continue
+        yield number, row, None
+
+
+def import_text(row, field, required=False, max_length=None):
+    """Read a stripped string field from an import row"""
+    value = row.get(field)
+    value = str(value).strip() if value is not None else ''
+    if required and not value:
+        raise ValueError(f'{field} is required')
+    if max_length and len(value) > max_length:
+        raise ValueError(f'{field} must be at most {max_length} characters')
+    return value or None
+
+
+def import_date(row, field):
+    """Read a required YYYY-MM-DD date field from an import row"""
+    value = import_text(row, field, required=True)
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise ValueError(f'{field} must be a date in YYYY-MM-DD format')
+
+
+def validate_item_row(row):
+    """Turn an import row into Item column values, raising ValueError if it is invalid"""
+    value = import_text(row, 'value')
+    if value is not None:
+        try:
+            value = float(value)
+        except ValueError:
+            raise ValueError('value must be a number')
+        if not math.isfinite(value):
+            raise ValueError('value must be a finite number')
+    return {
+        'name': import_text(row, 'name', required=True, max_length=200),
+        'category': import_text(row, 'category', required=True, max_length=50),
+        'date': import_date(row, 'date'),
+        'description': import_text(row, 'description', required=True),
+        'color': import_text(row, 'color', max_length=50),
+        'brand': import_text(row, 'brand', max_length=100),
+        'value': value,
+    }
+
+
+def validate_report_row(row, catalogue):
+    """Turn an import row into LostFoundItem column values, raising ValueError if it is invalid"""
+    name = import_text(row, 'name', required=True, max_length=200)
+    # Same rule as report(): the item must exist, and its category is used
+    if name not in catalogue:
+        raise ValueError(f'Item "{name}" does not exist in the system')
+    item_id, category = catalogue[name]
+    status = import_text(row, 'status', required=True)
+    if status not in ('lost', 'found'):
+        raise ValueError("status must be 'lost' or 'found'")
+    return {
+        'item_id': item_id,
+        'name': name,
+        'category': category,
+        'date': import_date(row, 'date'),
+        'location': import_text(row, 'location', required=True, max_length=200),
+        'description': import_text(row, 'description', required=True),
+        'contact': import_text(row, 'contact', required=True, max_length=120),
+        'phone': import_text(row, 'phone', max_length=20),
+        'student_id': import_text(row, 'student_id', max_length=50),
+        'program': import_text(row, 'program', max_length=50),
+        'department': import_text(row, 'department', max_length=100),
+        'status': status,
+    }
+
+
+def import_batch(kind, batch, result, seen_names):
+    """Validate one batch of rows and insert the valid ones in a single statement"""
+    names = {str(row.get('name') or '').strip() for _, row in batch}
+
+    if kind == 'items':
+        model = Item
+        existing = set(db.session.scalars(db.select(Item.name).where(Item.name.in_(names))))
+    else:
+        model = LostFoundItem
+        catalogue = {row.name: (row.id, row.category) for row in db.session.execute(
+            db.select(Item.id, Item.name, Item.category).where(Item.name.in_(names))
+        )}
+
+    valid_rows = []
+    valid_numbers = []
+    for number, row in batch:
+        try:
+            if kind == 'items':
+                values = validate_item_row(row)
+                if values['name'] in existing or values['name'] in seen_names:
+                    raise ValueError(f'An item named "{values["name"]}" already exists')
+                seen_names.add(values['name'])
+            else:
+                values = validate_report_row(row, catalogue)
+        except ValueError as e:
+            add_import_error(result, number, str(e))
+            continue
+        valid_rows.append(values)
+        valid_numbers.append(number)
+
+    if not valid_rows:
+        return
+
+    try:
+        db.session.execute(db.insert(model), valid_rows)
+        # Bulk inserts skip the flush hooks, so keep the counters current here
+        deltas = {}
+        for values in valid_rows:
+            for key in stat_counter_keys(model, values):
+                deltas[key] = deltas.get(key, 0) + 1
+        apply_stat_counter_deltas(db.session.connection(), deltas)
+        bump_table_versions(db.session.connection(), {model.__table__.name})
+        db.session.commit()
+        result['imported'] += len(valid_rows)
+    except Exception as e:
+        db.session.rollback()
+        app.logger.error(f'Bulk import batch failed: {str(e)}')
+        for number in valid_numbers:
+            add_import_error(result, number, f'Database error: {str(e.__class__.__name__)}')
+        if kind == 'items':
+            seen_names.difference_update(values['name'] for values in valid_rows)
+
+
+def add_import_error(result, number, message):
+    """Record a per-row import error, listing at most IMPORT_MAX_ERRORS of them"""
+    result['error_count'] += 1
+    if len(result['errors']) < IMPORT_MAX_ERRORS:
+        result['errors'].append({'row': number, 'error': message})
+
+
+def import_records(kind, records, batch_size=None):
+    """Import Items or lost/found reports from (row number, row, parse error) records
+
+    Rows are validated and written in batches of IMPORT_BATCH_SIZE, each batch
+    being one multi-row INSERT and one commit. Returns a summary with an error
+    entry for every rejected row.
+    """
+    batch_size = batch_size or IMPORT_BATCH_SIZE
+    result = {'kind': kind, 'imported': 0, 'error_count': 0, 'errors': []}
+    seen_names = set()
+    batch = []
+
+    for number, row, error in records:
+        if error:
+            add_import_error(result, number, error)
+            continue
+        batch.append((number, row))
+        if len(batch) >= batch_size:
+            import_batch(kind, batch, result, seen_names)
+            batch = []
+    if batch:
+        import_batch(kind, batch, result, seen_names)
+
+    if kind == 'reports' and result['imported']:
+        search_backend.invalidate()
+    if result['imported']:
+        autocomplete_index.invalidate()
+    result['errors'].sort(key=lambda error: error['row'])
+    return result
+
+
+# Synthetic data
+# Relative frequency of each report category, and the things reported in it
+SEED_CATEGORIES = {
+    'electronics': (30, ['Laptop', 'Phone', 'Headphones', 'Charger', 'Calculator', 'Power Bank', 'Tablet', 'Earbuds']),
+    'documents': (16, ['Student ID Card', 'Admit Card', 'Passport', 'Certificate', 'Library Card']),
+    'keys': (14, ['Room Key', 'Bike Key', 'Car Key', 'Key Ring', 'Locker Key']),
+    'clothing': (12, ['Jacket', 'Hoodie', 'Scarf', 'Cap', 'Sweater']),
+    'jewelry': (6, ['Ring', 'Bracelet', 'Necklace', 'Watch']),
+    'other': (22, ['Wallet', 'Umbrella', 'Water Bottle', 'Backpack', 'Notebook', 'Glasses', 'Pencil Case']),
+}
+SEED_BRANDS = {
+    'electronics': ['Dell', 'HP', 'Lenovo', 'Apple', 'Samsung', 'Xiaomi', 'Asus', 'Casio', 'Sony'],
+    'clothing': ['Nike', 'Adidas', 'Puma', 'Uniqlo', 'Aarong'],
+}
+SEED_COLORS = ['Black', 'White', 'Blue', 'Red', 'Silver', 'Grey', 'Green', 'Brown', 'Pink']
+SEED_LOCATIONS = ['Central Library', 'Library 2nd Floor', 'Cafeteria', 'Auditorium', 'Computer Lab 1',
+                  'Computer Lab 3', 'Building 1 Room 101', 'Building 2 Room 305', 'Building 4 Lobby',
+                  'Admin Building', 'Gymnasium', 'Playground', 'Prayer Room', 'Bus Stop', 'Parking Lot',
+                  'Main Gate', 'Student Lounge', 'Bookshop']
+SEED_PLACES = ['near the entrance', 'under a desk', 'by the stairs', 'on a bench', 'next to the lift',
+               'in the washroom', 'at the front counter', 'in row C']
+SEED_PROGRAMS = ['BSC', 'BBA', 'MBA', 'MCS', 'LLB', 'BA', 'MA']
+SEED_DEPARTMENTS = ['CSE', 'EEE', 'Business Administration', 'English', 'Law', 'Textile Engineering',
+                    'Civil Engineering', 'Economics']
+SEED_LOST_RATIO = 0.6  # more things are reported lost than found
+SEED_MEAN_AGE_DAYS = 60  # report dates cluster in the recent past
+SEED_MAX_AGE_DAYS = 730
+
+# Indexes of a table that do not back a constraint (primary key, unique), and its foreign keys
+SEED_SECONDARY_INDEXES_SQL = """
+    SELECT index_class.relname, pg_get_indexdef(index_class.oid)
+    FROM pg_index
+    JOIN pg_class AS index_class ON index_class.oid = pg_index.indexrelid
+    WHERE pg_index.indrelid = %s::regclass
+      AND NOT EXISTS (SELECT 1 FROM pg_constraint WHERE pg_constraint.conindid = pg_index.indexrelid)
+"""
+SEED_FOREIGN_KEYS_SQL = """
+    SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'f'
+"""
+
+SEED_ITEM_COLUMNS = ('name', 'category', 'date', 'description', 'color', 'brand', 'value')
+SEED_REPORT_COLUMNS = ('item_id', 'name', 'category', 'date', 'location', 'description', 'contact', 'phone',
+                       'student_id', 'program', 'department', 'status', 'created_at', 'updated_at')
+SEED_USER_COLUMNS = ('username', 'email', 'password_hash', 'remember_me', 'created_at', 'is_admin')
+
+
+def seed_date(rng, today):
+    """A date within SEED_MAX_AGE_DAYS, most of them recent"""
+    return today - timedelta(days=min(int(rng.expovariate(1 / SEED_MEAN_AGE_DAYS)), SEED_MAX_AGE_DAYS))
+
+
+def seed_item_rows(rng, count, today):
+    categories = list(SEED_CATEGORIES)
+    weights = [SEED_CATEGORIES[category][0] for category in categories]
+    for number in range(count):
+        category = rng.choices(categories, weights)[0]
+        thing = rng.choice(SEED_CATEGORIES[category][1])
+        color = rng.choice(SEED_COLORS)
+        brand = rng.choice(SEED_BRANDS[category]) if category in SEED_BRANDS else None
+        name = ' '.join(part for part in (color, brand, thing) if part) + f' #{number + 1:06d}'
+        value = round(rng.uniform(5, 1500), 2) if rng.random() < 0.5 else None
+        yield (name, category, seed_date(rng, today), f'{color} {thing.lower()}', color, brand, value)
+
+
+def seed_report_rows(rng, count, items, today):
+    """Reports of random catalogue items; category is copied from the item as on the report page
+
+    This runs once per report, so it avoids the slower Random.choice/randrange
+    in favour of scaling rng.random() and works from pre-formatted dates.
+    """
+    random_float = rng.random
+    catalogue = [(item_id, name, category, name.split(' #')[0]) for item_id, name, category in items]
+    days = [(today - timedelta(days=age)).isoformat() for age in range(SEED_MAX_AGE_DAYS + 1)]
+
+    def pick(options):
+        return options[int(random_float() * len(options))]
+
+    for _ in range(count):
+        item_id, name, category, label = pick(catalogue)
+        day = days[min(int(rng.expovariate(1 / SEED_MEAN_AGE_DAYS)), SEED_MAX_AGE_DAYS)]
+        seconds = int(random_float() * 86400)
+        created_at = f'{day} {seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}'
+        status = 'lost' if random_float() < SEED_LOST_RATIO else 'found'
+        student = random_float() < 0.7
+        yield (
+            item_id, name, category, day, pick(SEED_LOCATIONS), f'{label} {status} {pick(SEED_PLACES)}',
+            f'student{int(random_float() * 100000):05d}@bubt.edu.bd',
+            f'01{300000000 + int(random_float() * 700000000)}' if random_float() < 0.5 else None,
+            f'{18 + int(random_float() * 6)}{int(random_float() * 1000000):06d}' if student else None,
+            pick(SEED_PROGRAMS) if student else None,
+            pick(SEED_DEPARTMENTS) if student else None,
+            status, created_at, created_at,
+        )
+
+
+def seed_user_rows(rng, count, today, prefix):
+    for number in range(count):
+        created_at = datetime.combine(seed_date(rng, today), datetime.min.time())
+        # Passwords are stored as-is, like User.set_password does
+        yield (f'{prefix}{number + 1:06d}', f'{prefix}{number + 1:06d}@bubt.edu.bd', 'password123',
+               False, created_at, False)
+
+
+class CsvRowStream:
+    """Read-only file object that renders rows as CSV for COPY ... FROM STDIN
+
+    A background thread renders the rows a few chunks ahead of the reader, so
+    generating them in Python overlaps with Postgres inserting earlier chunks.
+    """
+    CHUNK_SIZE = 1 << 20
+
+    def __init__(self, rows):
+        self._chunks = queue.Queue(maxsize=4)
+        self._error = None
+        self._finished = False
+        threading.Thread(target=self._render, args=(rows,), daemon=True).start()
+
+    def _render(self, rows):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        try:
+            for row in rows:
+                writer.writerow(['\\N' if value is None else value for value in row])
+                if buffer.tell() >= self.CHUNK_SIZE:
+                    self._chunks.put(buffer.getvalue())
+                    buffer.seek(0)
+                    buffer.truncate()
+            if buffer.tell():
+                self._chunks.put(buffer.getvalue())
+        except Exception as e:
+            self._error = e
+        finally:
+            self._chunks.put(None)
+
+    def read(self, size=-1):
+        if self._finished:
+            return ''
+        chunk = self._chunks.get()
+        if chunk is None:
+            self._finished = True
+            if self._error:
+                raise self._error
+            return ''
+        return chunk
+
+
+def copy_rows(cursor, table, columns, rows, skip_existing=False):
+    """Bulk load rows with a single streamed COPY; returns the number written
+
+    With skip_existing, rows are copied into a temporary table first and any
+    that clash with a unique key already in the table are left out.
+    """
+    column_list = ', '.join(columns)
+    target = f'seed_{table}' if skip_existing else table
+    if skip_existing:
+        cursor.execute(f'CREATE TEMP TABLE {target} (LIKE {table} INCLUDING DEFAULTS)')
+    cursor.copy_expert(f"COPY {target} ({column_list}) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+                       CsvRowStream(rows), size=CsvRowStream.CHUNK_SIZE)
+    written = cursor.rowcount
+
+    if skip_existing:
+        cursor.execute(f'INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {target} '
+                       f'ON CONFLICT DO NOTHING')
+        written = cursor.rowcount
+        cursor.execute(f'DROP TABLE {target}')
+    return written
+
+
+@contextmanager
+def rebuilt_after_load(cursor, table):
+    """Drop a table's secondary indexes and foreign keys for a bulk load, then rebuild them
+
+    Building an index or checking a foreign key once over the loaded table is
+    much quicker than maintaining it row by row. DDL is transactional, so a
+    failed load rolls back to the original indexes and constraints.
+    """
+    cursor.execute(SEED_SECONDARY_INDEXES_SQL, (table,))
+    indexes = cursor.fetchall()
+    cursor.execute(SEED_FOREIGN_KEYS_SQL, (table,))
+    foreign_keys = cursor.fetchall()
+    for name, _ in foreign_keys:
+        cursor.execute(f'ALTER TABLE {table} DROP CONSTRAINT {name}')
+    for name, _ in indexes:
+        cursor.execute(f'DROP INDEX {name}')
+
+    yield
+
+    cursor.execute("SET LOCAL maintenance_work_mem = '256MB'")
+    for _, definition in indexes:
+        cursor.execute(definition)
+    for name, definition in foreign_keys:
+        cursor.execute(f'ALTER TABLE {table} ADD CONSTRAINT {name} {definition}')
+
+
+def seed_database(items=0, reports=0, users=0, seed=0):
+    """Generate a deterministic synthetic dataset and bulk load it with COPY
+
+    The same seed always produces the same rows. Reports reference the items
+    created in this run, or the existing catalogue when no items are
+    generated. Everything is loaded in one transaction.
+    """
+    rng = random.Random(seed)
+    today = date.today()
+    counts = {}
+
+    connection = db.engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        item_rows = list(seed_item_rows(rng, items, today))
+        counts['items'] = copy_rows(cursor, 'item', SEED_ITEM_COLUMNS, item_rows, skip_existing=True)
+
+        if reports:
+            if item_rows:
+                cursor.execute('SELECT id, name, category FROM item WHERE name = ANY(%s) ORDER BY name',
+                               ([row[0] for row in item_rows],))
+            else:
+                cursor.execute('SELECT id, name, category FROM item ORDER BY name')
+            catalogue = cursor.fetchall()
+            if not catalogue:
+                raise ValueError('Reports need catalogue items; generate some with --items')
+            # Rebuilding indexes costs time in proportion to the whole table, so it only
+            # pays off when the load is at least as big as what is already there
+            cursor.execute("SELECT reltuples FROM pg_class WHERE oid = 'lost_found_item'::regclass")
+            existing = max(cursor.fetchone()[0], 0)
+            with rebuilt_after_load(cursor, 'lost_found_item') if reports >= existing else nullcontext():
+                counts['reports'] = copy_rows(cursor, 'lost_found_item', SEED_REPORT_COLUMNS,
+                                              seed_report_rows(rng, reports, catalogue, today))
+
+        counts['users'] = copy_rows(cursor, 'userid', SEED_USER_COLUMNS,
+                                    seed_user_rows(rng, users, today, f'seed{seed}_user'), skip_existing=True)
+        connection.commit()
+    finally:
+        connection.close()
+
+    # COPY bypasses the ORM hooks, so refresh everything derived from these tables
+    rebuild_stat_counters()
+    with db.engine.begin() as versions_connection:
+        bump_table_versions(versions_connection, ['item', 'lost_found_item', 'userid'])
+        versions_connection.execute(db.text('ANALYZE item; ANALYZE lost_found_item; ANALYZE userid'))
+    search_backend.invalidate()
+    autocomplete_index.invalidate()
+    response_cache.invalidate()
+    return counts
 
 
 # Authentication Helper
+# How long the admin flag cached in the (signed) session is trusted before it is re-read
+ADMIN_RECHECK_SECONDS = int(os.getenv('ADMIN_RECHECK_SECONDS', '60'))
+
+
+def load_current_user():
+    """Return the logged-in User, loading it at most once per request"""
+    if 'current_user' not in g:
+        user_id = session.get('user_id')
+        g.current_user = db.session.get(User, user_id) if user_id is not None else None
+    return g.current_user
+
+
+def remember_admin_flag(user):
+    """Cache the user's admin flag in the session"""
+    session['is_admin'] = user.is_admin_user() if user else False
+    session['admin_checked_at'] = int(time.time())
+    return session['is_admin']
+
+
+def current_user_is_admin():
+    """Check if current user is admin, using the session's cached flag while it is fresh"""
+    if 'is_admin' not in g:
+        if 'user_id' not in session:
+            g.is_admin = False
+        elif 'is_admin' in session and time.time() - session.get('admin_checked_at', 0) < ADMIN_RECHECK_SECONDS:
+            g.is_admin = session['is_admin']
+        else:
+            g.is_admin = remember_admin_flag(load_current_user())
+    return g.is_admin
+
+
 def login_required(f):
     """Decorator to require login for routes"""
     from functools import wraps
     
     @wraps(f)
     def decorated_function(*args, **kwargs):
+        # The signed session is trusted, so this costs no query; views that need the
+        # User itself get it from load_current_user()
         if 'user_id' not in session:
-            if request.is_json:
-                return jsonify({'error': 'Authentication required'}), 401
+            if request.is_json or request.path.startswith('/api/'):
+                return jsonify({'error': 'Unauthorized'}), 401
             flash('Please login to access this page', 'warning')
             return redirect(url_for('login'))
         return f(*args, **kwargs)
@@ -146,6 +2564,7 @@ def login_required(f):
 
 # Routes
 @app.route('/')
+@query_budget(1)
 def index():
     """Welcome page - landing page before login"""
     return render_template('welcome.html')
@@ -196,6 +2615,7 @@ def login():
                 session['user_id'] = user.id
                 session['username'] = user.username
                 session['email'] = user.email
+                remember_admin_flag(user)
                 
                 if remember_me:
                     session.permanent = True
@@ -276,13 +2696,7 @@ def register():
                     return jsonify({'success': False, 'message': error_message}), 400
                 for error in errors:
                     flash(error, 'error')
-                # Check if user is admin for template
-                user = None
-                is_admin = False
-                if 'user_id' in session:
-                    user = User.query.get(session.get('user_id'))
-                    is_admin = user.is_admin_user() if user else False
-                return render_template('register.html', is_admin=is_admin)
+                return render_template('register.html', is_admin=current_user_is_admin())
         
         # Create new user
         try:
@@ -314,22 +2728,10 @@ def register():
             if request.headers.get('X-Requested-With') == 'XMLHttpRequest' or request.is_json:
                 return jsonify({'success': False, 'message': error_msg}), 500
             flash(error_msg, 'error')
-            # Check if user is admin for template
-            user = None
-            is_admin = False
-            if 'user_id' in session:
-                user = User.query.get(session.get('user_id'))
-                is_admin = user.is_admin_user() if user else False
-            return render_template('register.html', is_admin=is_admin)
+            return render_template('register.html', is_admin=current_user_is_admin())
     
     # Check if user is admin for template
-    user = None
-    is_admin = False
-    if 'user_id' in session:
-        user = User.query.get(session.get('user_id'))
-        is_admin = user.is_admin_user() if user else False
-    
-    return render_template('register.html', is_admin=is_admin)
+    return render_template('register.html', is_admin=current_user_is_admin())
 
 
 @app.route('/logout')
@@ -341,34 +2743,10 @@ def logout():
     return redirect(url_for('login'))
 
 
-@app.route('/dashboard')
-def dashboard():
-    """Dashboard page"""
-    if 'user_id' not in session:
-        flash('Please login to access the dashboard', 'warning')
-        return redirect(url_for('login'))
-    
-    # Get real-time statistics from database
-    total_items = Item.query.count()
-    total_lost_found = LostFoundItem.query.count()
-    
-    # Get lost and found counts from LostFoundItem table
-    lost_items_count = LostFoundItem.query.filter_by(status='lost').count()
-    found_items_count = LostFoundItem.query.filter_by(status='found').count()
-    
-    # Get today's summary
-    today = datetime.now().date()
-    today_items = Item.query.filter(
-        db.func.date(Item.date) == today
-    ).count()
-    today_lost = LostFoundItem.query.filter(
-        db.func.date(LostFoundItem.date) == today,
-        LostFoundItem.status == 'lost'
-    ).count()
-    today_found = LostFoundItem.query.filter(
-        db.func.date(LostFoundItem.date) == today,
-        LostFoundItem.status == 'found'
-    ).count()
+def load_dashboard_data():
+    """Query the statistics and recent items shown on the dashboard"""
+    # Get real-time statistics from the counter table
+    stats = get_stats()
     
     # Get recent lost/found items (from LostFoundItem table)
     recent_lost_found = LostFoundItem.query.order_by(
@@ -378,44 +2756,93 @@ def dashboard():
     # Get recent items (from Item table)
     recent_items = Item.query.order_by(Item.date.desc()).limit(10).all()
     
-    # Get weekly statistics (last 7 days)
-    seven_days_ago = datetime.now().date() - timedelta(days=7)
-    weekly_lost = LostFoundItem.query.filter(
-        LostFoundItem.date >= seven_days_ago,
-        LostFoundItem.status == 'lost'
-    ).count()
-    weekly_found = LostFoundItem.query.filter(
-        LostFoundItem.date >= seven_days_ago,
-        LostFoundItem.status == 'found'
-    ).count()
+    return {
+        'stats': stats,
+        'recent_lost_found': [model_to_dict(item) for item in recent_lost_found],
+        'recent_items': [model_to_dict(item) for item in recent_items],
+    }
+
+
+DASHBOARD_GRID_SIZE = 10
+DASHBOARD_MAX_GRID_SIZE = 50
+DASHBOARD_GRID_FIELDS = ('id', 'name', 'category', 'date', 'location', 'contact', 'phone')
+
+
+def load_dashboard_grids(limit):
+    """Query the headline counts and the newest lost and found reports for the dashboard grids"""
+    stats = get_stats()
+    grids = {}
+    for status in ('lost', 'found'):
+        # Newest first by report date, read from the (status, date) index
+        rows = db.session.execute(
+            db.select(*columns_for(LostFoundItem, DASHBOARD_GRID_FIELDS))
+            .where(LostFoundItem.status == status)
+            .order_by(LostFoundItem.date.desc(), LostFoundItem.id.desc())
+            .limit(limit)
+        ).all()
+        grids[status] = [serialize_row(row, DASHBOARD_GRID_FIELDS) for row in rows]
     
+    return {
+        'stats': {key: stats[key] for key in ('total_items', 'total_lost_found', 'lost_items',
+                                              'found_items', 'today_lost', 'today_found')},
+        'lost': grids['lost'],
+        'found': grids['found'],
+    }
+
+
+@app.route('/dashboard')
+@query_budget(4)  # counters, newest reports, newest items, plus the admin-flag re-check
+@login_required
+def dashboard():
+    """Dashboard page"""
     # Check if user is admin
-    user = User.query.get(session.get('user_id'))
-    is_admin = user.is_admin_user() if user else False
+    is_admin = current_user_is_admin()
+    
+    # Statistics and recent items are shared by all users until the next write
+    data = response_cache.get_or_compute(cache_key(is_admin), load_dashboard_data)
+    stats = data['stats']
     
     return render_template('dashboard.html',
-                         total_items=total_items,
-                         total_lost_found=total_lost_found,
-                         lost_items=lost_items_count,
-                         found_items=found_items_count,
-                         today_items=today_items,
-                         today_lost=today_lost,
-                         today_found=today_found,
-                         weekly_lost=weekly_lost,
-                         weekly_found=weekly_found,
-                         recent_items=recent_items,
-                         recent_lost_found=recent_lost_found,
+                         total_items=stats['total_items'],
+                         total_lost_found=stats['total_lost_found'],
+                         lost_items=stats['lost_items'],
+                         found_items=stats['found_items'],
+                         today_items=stats['today_items'],
+                         today_lost=stats['today_lost'],
+                         today_found=stats['today_found'],
+                         weekly_lost=stats['weekly_lost'],
+                         weekly_found=stats['weekly_found'],
+                         recent_items=data['recent_items'],
+                         recent_lost_found=data['recent_lost_found'],
                          username=session.get('username', 'User'),
                          is_admin=is_admin)
 
 
+# Reports per page in the report page lists; later pages come from /api/search
+REPORT_PAGE_SIZE = 20
+REPORT_LIST_FIELDS = ('id', 'name', 'category', 'status', 'date', 'location')
+
+
+def load_report_data():
+    """Query the first page of lost and of found reports shown on the report page
+
+    The item picker searches /api/autocomplete as the user types, so the catalogue
+    is not loaded here.
+    """
+    data = {}
+    for status in ('lost', 'found'):
+        filters = {**search_filters_from_args({}), 'status': status, 'sort': 'date-desc'}
+        items, next_cursor = search_page(filters, REPORT_PAGE_SIZE, fields=REPORT_LIST_FIELDS)
+        data[f'{status}_items'] = items
+        data[f'{status}_cursor'] = next_cursor
+    return data
+
+
 @app.route('/report', methods=['GET', 'POST'])
+@query_budget(4)
+@login_required
 def report():
     """Report lost/found items page"""
-    if 'user_id' not in session:
-        flash('Please login to report items', 'warning')
-        return redirect(url_for('login'))
-    
     try:
         if request.method == 'POST':
             form_type = request.form.get('form_type', 'lost')
@@ -448,7 +2875,7 @@ def report():
                     flash('Please fill in all required fields', 'error')
                     return redirect(url_for('report'))
                 
-                # Check if item exists in Item table (name must exist as foreign key)
+                # Check if item exists in Item table (reports reference it by id)
                 existing_item = Item.query.filter_by(name=item_name).first()
                 if not existing_item:
                     flash(f'Item "{item_name}" does not exist in the system. Please create the item first using "Create Item" page.', 'error')
@@ -465,9 +2892,10 @@ def report():
                     return redirect(url_for('report'))
                 
                 # Create new lost/found item in LostFoundItem table
-                # name is foreign key referencing Item.name
+                # item_id is the foreign key referencing Item.id
                 new_lost_found_item = LostFoundItem(
-                    name=item_name,  # Foreign key to Item.name
+                    item_id=existing_item.id,  # Foreign key to Item.id
+                    name=existing_item.name,
                     category=item_category,  # Get from Item table
                     date=item_date,
                     location=item_location,
@@ -481,9 +2909,20 @@ def report():
                 )
                 
                 db.session.add(new_lost_found_item)
-                db.session.commit()
+                if background_tasks_enabled():
+                    # Matching runs in the worker; the task commits together with the report
+                    db.session.flush()
+                    enqueue_task('match_report', report_id=new_lost_found_item.id)
+                    db.session.commit()
+                    match_count = 0
+                else:
+                    db.session.commit()
+                    # Look for reports of the opposite status that may be the same item
+                    match_count = record_matches(new_lost_found_item)
                 
                 flash(f'{form_type.capitalize()} item reported successfully!', 'success')
+                if match_count:
+                    flash(f'We found {match_count} possible match(es) for your report.', 'info')
                 return redirect(url_for('report'))
             except Exception as e:
                 app.logger.error(f'Error creating report: {str(e)}')
@@ -492,21 +2931,19 @@ def report():
                 flash(f'Error submitting report: {str(e)}', 'error')
                 return redirect(url_for('report'))
         
-        # Get all items from Item table for dropdown selection
-        all_items = Item.query.order_by(Item.name.asc()).all()
-        
-        # Get all lost and found items for display
-        lost_items = LostFoundItem.query.filter_by(status='lost').order_by(LostFoundItem.date.desc()).all()
-        found_items = LostFoundItem.query.filter_by(status='found').order_by(LostFoundItem.date.desc()).all()
-        
         # Check if user is admin
         is_admin = require_admin()
         
+        data = response_cache.get_or_compute(cache_key(is_admin), load_report_data)
+        
         return render_template('report.html', 
                              is_admin=is_admin,
-                             all_items=all_items,
-                             lost_items=lost_items,
-                             found_items=found_items)
+                             lost_items=data['lost_items'],
+                             lost_cursor=data['lost_cursor'],
+                             found_items=data['found_items'],
+                             found_cursor=data['found_cursor'],
+                             page_size=REPORT_PAGE_SIZE,
+                             list_fields=','.join(REPORT_LIST_FIELDS))
     except Exception as e:
         app.logger.error(f'Error in report route: {str(e)}')
         flash('Error loading page. Please try again.', 'error')
@@ -514,96 +2951,44 @@ def report():
 
 
 @app.route('/search')
+@query_budget(2)
+@login_required
 def search():
     """Search items page"""
-    if 'user_id' not in session:
-        flash('Please login to search items', 'warning')
-        return redirect(url_for('login'))
-    
     try:
         # Get filter parameters
-        search_term = request.args.get('q', '').lower()
-        category = request.args.get('category', '')
-        status = request.args.get('status', '')
-        date_from = request.args.get('date_from', '')
-        date_to = request.args.get('date_to', '')
-        location = request.args.get('location', '').lower()
-        
-        # Build query for LostFoundItem table (shows lost/found items with status)
-        query = LostFoundItem.query
-        
-        if search_term:
-            query = query.filter(
-                db.or_(
-                    LostFoundItem.name.ilike(f'%{search_term}%'),
-                    LostFoundItem.description.ilike(f'%{search_term}%'),
-                    LostFoundItem.location.ilike(f'%{search_term}%')
-                )
-            )
-        
-        if category:
-            query = query.filter(LostFoundItem.category == category)
+        filters = search_filters_from_args(request.args)
+        search_term = filters['q'].lower()
         
-        if status:
-            query = query.filter(LostFoundItem.status == status)
-        
-        if date_from:
-            query = query.filter(LostFoundItem.date >= datetime.strptime(date_from, '%Y-%m-%d').date())
-        
-        if date_to:
-            query = query.filter(LostFoundItem.date <= datetime.strptime(date_to, '%Y-%m-%d').date())
-        
-        if location:
-            query = query.filter(LostFoundItem.location.ilike(f'%{location}%'))
-        
-        # Get sort parameter
-        sort_by = request.args.get('sort', 'date-desc')
-        if sort_by == 'date-desc':
-            query = query.order_by(LostFoundItem.date.desc())
-        elif sort_by == 'date-asc':
-            query = query.order_by(LostFoundItem.date.asc())
-        elif sort_by == 'name-asc':
-            query = query.order_by(LostFoundItem.name.asc())
-        elif sort_by == 'name-desc':
-            query = query.order_by(LostFoundItem.name.desc())
-        elif sort_by == 'category':
-            query = query.order_by(LostFoundItem.category.asc())
-        elif sort_by == 'status':
-            query = query.order_by(LostFoundItem.status.asc())
-        
-        items = query.all()
+        # Only the first page is rendered; search.html fetches the rest from /api/search
+        items, next_cursor = search_page(filters, SEARCH_PAGE_SIZE, request.args.get('cursor'))
         
         # Get user info for template
-        user = User.query.get(session.get('user_id'))
-        is_admin = user.is_admin_user() if user else False
+        is_admin = current_user_is_admin()
         
-        print(f"[DEBUG] Rendering search.html with {len(items)} lost/found items")
-        result = render_template('search.html', 
+        return render_template('search.html', 
                              items=items, 
+                             next_cursor=next_cursor,
+                             filters=filters,
+                             page_size=SEARCH_PAGE_SIZE,
                              search_term=search_term,
                              username=session.get('username', 'User'),
                              is_admin=is_admin)
-        print(f"[DEBUG] Template rendered successfully, length: {len(result)}")
-        return result
     except Exception as e:
         import traceback
         error_msg = f'Error in search route: {str(e)}\n{traceback.format_exc()}'
         app.logger.error(error_msg)
-        print(f"[ERROR] {error_msg}")
         flash('Error loading search page. Please try again.', 'error')
         return redirect(url_for('dashboard'))
 
 
 @app.route('/create-item', methods=['GET', 'POST'])
+@query_budget(2)
+@login_required
 def create_item():
     """Create new item page - Admin only"""
-    if 'user_id' not in session:
-        flash('Please login to create items', 'warning')
-        return redirect(url_for('login'))
-    
     # Check if user is admin
-    user = User.query.get(session.get('user_id'))
-    if not user or not user.is_admin_user():
+    if not current_user_is_admin():
         flash('Access denied. Only admin users can create items.', 'error')
         return redirect(url_for('dashboard'))
     
@@ -673,99 +3058,71 @@ def create_item():
     
     try:
         # Get user info for template
-        user = User.query.get(session.get('user_id'))
-        is_admin = user.is_admin_user() if user else False
+        is_admin = current_user_is_admin()
         
         # Get all items from database - show minimum 10 most recent items
         # Order by date descending for most recent first
         available_items = Item.query.order_by(Item.date.desc()).limit(10).all()
         
-        # Debug: Print item count and first item details to confirm database data
-        print(f"[DEBUG] Available items from DATABASE: {len(available_items)} items found")
-        if available_items:
-            print(f"[DEBUG] First item from DB: {available_items[0].name} - {available_items[0].category} - Date: {available_items[0].date}")
-        else:
-            print(f"[DEBUG] No items found in database")
-        
-        print(f"[DEBUG] Rendering create-item.html for user: {session.get('username')}")
-        result = render_template('create-item.html', 
+        return render_template('create-item.html', 
                              username=session.get('username', 'User'),
                              is_admin=is_admin,
                              available_items=available_items)
-        print(f"[DEBUG] Template rendered successfully, length: {len(result)}")
-        return result
     except Exception as e:
         import traceback
         error_msg = f'Error rendering create-item template: {str(e)}\n{traceback.format_exc()}'
         app.logger.error(error_msg)
-        print(f"[ERROR] {error_msg}")
         flash('Error loading page. Please try again.', 'error')
         return redirect(url_for('dashboard'))
 
 
+def load_about_data():
+    """Query the statistics and recent activity shown on the about page"""
+    # Get recent activity (last 5 items)
+    recent_activity = LostFoundItem.query.order_by(
+        LostFoundItem.created_at.desc()
+    ).limit(5).all()
+    
+    return {
+        'stats': get_stats(),
+        'recent_activity': [model_to_dict(item) for item in recent_activity],
+    }
+
+
 @app.route('/about')
+@query_budget(3)
+@login_required
 def about():
     """About page with real-time statistics"""
-    if 'user_id' not in session:
-        flash('Please login to view this page', 'warning')
-        return redirect(url_for('login'))
     try:
-        # Get real-time statistics
-        total_items = Item.query.count()
-        total_lost_found_items = LostFoundItem.query.count()
-        total_users = User.query.count()
-        
-        # Get lost and found counts
-        lost_items_count = LostFoundItem.query.filter_by(status='lost').count()
-        found_items_count = LostFoundItem.query.filter_by(status='found').count()
-        
-        # Get today's activity
-        today = datetime.now().date()
-        today_items = Item.query.filter(
-            db.func.date(Item.date) == today
-        ).count()
-        today_lost_found = LostFoundItem.query.filter(
-            db.func.date(LostFoundItem.date) == today
-        ).count()
+        # Get user info for template
+        is_admin = current_user_is_admin()
         
-        # Get recent items (last 7 days)
-        seven_days_ago = datetime.now().date() - timedelta(days=7)
-        recent_items_count = LostFoundItem.query.filter(
-            LostFoundItem.date >= seven_days_ago
-        ).count()
+        data = response_cache.get_or_compute(cache_key(is_admin), load_about_data)
+        stats = data['stats']
+        total_lost_found_items = stats['total_lost_found']
+        found_items_count = stats['found_items']
         
         # Calculate success rate (found items / total lost+found items)
         success_rate = 0
         if total_lost_found_items > 0:
             success_rate = round((found_items_count / total_lost_found_items) * 100, 1)
         
-        # Get most active categories
-        category_counts = db.session.query(
-            LostFoundItem.category,
-            db.func.count(LostFoundItem.id).label('count')
-        ).group_by(LostFoundItem.category).order_by(db.func.count(LostFoundItem.id).desc()).limit(5).all()
-        
-        # Get recent activity (last 5 items)
-        recent_activity = LostFoundItem.query.order_by(
-            LostFoundItem.created_at.desc()
-        ).limit(5).all()
-        
-        # Get user info for template
-        user = User.query.get(session.get('user_id'))
-        is_admin = user.is_admin_user() if user else False
+        # Most active categories
+        category_counts = stats['category_counts'][:5]
         
         return render_template('about.html',
-                             total_items=total_items,
+                             total_items=stats['total_items'],
                              total_lost_found_items=total_lost_found_items,
-                             total_users=total_users,
-                             lost_items_count=lost_items_count,
+                             total_users=stats['total_users'],
+                             lost_items_count=stats['lost_items'],
                              found_items_count=found_items_count,
-                             today_items=today_items,
-                             today_lost_found=today_lost_found,
-                             recent_items_count=recent_items_count,
+                             today_items=stats['today_items'],
+                             today_lost_found=stats['today_lost'] + stats['today_found'],
+                             recent_items_count=stats['weekly_lost'] + stats['weekly_found'],
                              success_rate=success_rate,
                              category_counts=category_counts,
-                             recent_activity=recent_activity,
+                             recent_activity=data['recent_activity'],
                              is_admin=is_admin)
     except Exception as e:
         app.logger.error(f'Error rendering about template: {str(e)}')
@@ -775,22 +3132,14 @@ def about():
 
 def require_admin():
     """Check if current user is admin"""
-    if 'user_id' not in session:
-        return False
-    user = User.query.get(session['user_id'])
-    if not user:
-        return False
-    return user.is_admin_user()
+    return current_user_is_admin()
 
 
 @app.route('/admin/files', methods=['GET', 'POST'])
+@query_budget(2)
+@login_required
 def admin_files():
     """Admin-only page to view all users and manage them"""
-    # Check if user is logged in
-    if 'user_id' not in session:
-        flash('Please login to access this page', 'warning')
-        return redirect(url_for('login'))
-    
     # Check if user is admin
     if not require_admin():
         flash('Access denied. Admin privileges required.', 'error')
@@ -821,8 +3170,7 @@ def admin_files():
         all_users = User.query.order_by(User.created_at.desc()).all()
         
         # Get user info for template
-        current_user = User.query.get(session.get('user_id'))
-        is_admin = current_user.is_admin_user() if current_user else False
+        is_admin = current_user_is_admin()
         
         return render_template('admin_files.html', 
                              users=all_users,
@@ -835,81 +3183,226 @@ def admin_files():
 
 
 # API Routes
+def conditional_api_response(table, build_response):
+    """Return 304 Not Modified when the client's copy of a table-backed response is current
+
+    The ETag comes from the table version and the full request path, so a
+    matching If-None-Match skips the query and serialization done by
+    build_response entirely. If-Modified-Since is only trusted when the
+    version falls on a whole second: HTTP dates have one-second resolution, so
+    otherwise a second write in the same second would look unmodified.
+    """
+    version = table_version(table)
+    etag = hashlib.sha1(f'{table}:{version}:{request.full_path}'.encode()).hexdigest()
+    last_modified = datetime.utcfromtimestamp(version // 1000) if version else None
+    exact_last_modified = last_modified if version % 1000 == 0 else None
+    
+    if not is_resource_modified(request.environ, etag=etag, last_modified=exact_last_modified):
+        response = app.response_class(status=304)
+    else:
+        response = app.make_response(build_response())
+        if response.status_code != 200:
+            return response
+    
+    response.set_etag(etag)
+    if last_modified:
+        response.last_modified = last_modified
+    # Clients may keep the response but must revalidate it each time
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+
 @app.route('/api/search', methods=['GET'])
+@query_budget(3)
+@login_required
 def api_search():
     """API endpoint for searching lost/found items"""
-    if 'user_id' not in session:
-        return jsonify({'error': 'Unauthorized'}), 401
+    def build_response():
+        # Build query for LostFoundItem table from the shared search filters
+        filters = search_filters_from_args(request.args)
+        try:
+            fields = fields_from_args(request.args, LOST_FOUND_ITEM_FIELDS)
+            items, next_cursor = search_page(filters, search_limit_from_args(request.args),
+                                             request.args.get('cursor'), fields)
+        except (InvalidCursor, ValueError) as e:
+            return jsonify({'error': str(e)}), 400
+        
+        return jsonify({
+            'items': items,
+            'next_cursor': next_cursor
+        })
     
-    # Get filter parameters
-    search_term = request.args.get('q', '').strip()
-    category = request.args.get('category', '')
-    status = request.args.get('status', '')
-    date_from = request.args.get('date_from', '')
-    date_to = request.args.get('date_to', '')
-    location = request.args.get('location', '').strip()
+    return conditional_api_response(LostFoundItem.__table__.name, build_response)
+
+
+@app.route('/api/autocomplete', methods=['GET'])
+@query_budget(2)
+@login_required
+def api_autocomplete():
+    """API endpoint for item name and location completions, e.g. ?field=item&q=lap"""
+    field = request.args.get('field', 'item')
+    if field not in AutocompleteIndex.FIELDS:
+        return jsonify({'error': f"field must be one of: {', '.join(AutocompleteIndex.FIELDS)}"}), 400
+    prefix = request.args.get('q', '')
+    limit = max(1, min(request.args.get('limit', AUTOCOMPLETE_LIMIT, type=int), AUTOCOMPLETE_MAX_LIMIT))
     
-    # Build query for LostFoundItem table
-    query = LostFoundItem.query
+    response = jsonify({
+        'field': field,
+        'q': prefix,
+        'suggestions': autocomplete_index.complete(field, prefix, limit) if prefix.strip() else [],
+    })
+    # Typing back over a prefix repeats requests; let the browser reuse them briefly
+    response.cache_control.private = True
+    response.cache_control.max_age = 60
+    return response
+
+
+EXPORT_BATCH_SIZE = 1000
+
+
+@app.route('/api/export', methods=['GET'])
+@login_required
+def api_export():
+    """API endpoint for exporting search results as streamed CSV or NDJSON
+
+    Takes the same filters as /api/search. Rows are read through a server-side
+    cursor and written out in chunks, so memory use does not grow with the export.
+    """
+    data_format = request.args.get('format', 'csv')
+    if data_format not in ('csv', 'ndjson'):
+        return jsonify({'error': "format must be 'csv' or 'ndjson'"}), 400
     
-    if search_term:
-        query = query.filter(
-            db.or_(
-                LostFoundItem.name.ilike(f'%{search_term}%'),
-                LostFoundItem.description.ilike(f'%{search_term}%'),
-                LostFoundItem.location.ilike(f'%{search_term}%')
-            )
-        )
+    try:
+        fields = fields_from_args(request.args, LOST_FOUND_ITEM_FIELDS)
+        query = build_search_query(search_filters_from_args(request.args))[0]
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    rows = query.with_entities(*columns_for(LostFoundItem, fields)).yield_per(EXPORT_BATCH_SIZE)
+    
+    def generate_csv():
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=fields)
+        
+        def drain():
+            value = buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            return value
+        
+        # Send the header straight away, then one chunk per batch of rows
+        writer.writeheader()
+        yield drain()
+        for count, row in enumerate(rows, start=1):
+            writer.writerow(serialize_row(row, fields))
+            if count % EXPORT_BATCH_SIZE == 0:
+                yield drain()
+        yield drain()
+    
+    def generate_ndjson():
+        chunk = []
+        for row in rows:
+            chunk.append(json.dumps(serialize_row(row, fields)))
+            if len(chunk) == EXPORT_BATCH_SIZE:
+                yield '\n'.join(chunk) + '\n'
+                chunk = []
+        if chunk:
+            yield '\n'.join(chunk) + '\n'
     
-    if category:
-        query = query.filter(LostFoundItem.category == category)
+    if data_format == 'csv':
+        generator, mimetype = generate_csv(), 'text/csv'
+    else:
+        generator, mimetype = generate_ndjson(), 'application/x-ndjson'
+    
+    return Response(
+        stream_with_context(generator),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename=lost_found_export.{data_format}'}
+    )
+
+
+@app.route('/api/reports/<int:report_id>/matches', methods=['GET'])
+@query_budget(3)
+@login_required
+def api_report_matches(report_id):
+    """API endpoint for the ranked matches of a lost/found report"""
+    report_item = db.session.get(LostFoundItem, report_id)
+    if report_item is None:
+        abort(404)
     
-    if status:
-        query = query.filter(LostFoundItem.status == status)
+    if report_item.status == 'lost':
+        own_column, other_column = ReportMatch.lost_id, ReportMatch.found_id
+    else:
+        own_column, other_column = ReportMatch.found_id, ReportMatch.lost_id
     
-    if date_from:
-        query = query.filter(LostFoundItem.date >= datetime.strptime(date_from, '%Y-%m-%d').date())
+    rows = db.session.execute(
+        db.select(ReportMatch.score, *columns_for(LostFoundItem, LOST_FOUND_ITEM_FIELDS))
+        .join(LostFoundItem, LostFoundItem.id == other_column)
+        .where(own_column == report_id)
+        .order_by(ReportMatch.score.desc())
+    ).all()
     
-    if date_to:
-        query = query.filter(LostFoundItem.date <= datetime.strptime(date_to, '%Y-%m-%d').date())
+    return jsonify({
+        'report_id': report_id,
+        'matches': [dict(serialize_row(row, LOST_FOUND_ITEM_FIELDS), score=row.score) for row in rows]
+    })
+
+
+@app.route('/api/feed', methods=['GET'])
+@login_required
+def api_feed():
+    """Server-Sent Events stream of newly committed lost/found reports"""
+    try:
+        last_event_id = int(request.headers.get('Last-Event-ID', ''))
+    except ValueError:
+        last_event_id = None
     
-    if location:
-        query = query.filter(LostFoundItem.location.ilike(f'%{location}%'))
+    feed_broker.start()
+    subscriber = report_feed.subscribe(last_event_id)
     
-    items = query.order_by(LostFoundItem.date.desc()).all()
+    # Deliberately not wrapped in stream_with_context: the stream holds no
+    # request context or database session while it waits for events
+    def generate():
+        try:
+            yield 'retry: 5000\n\n'
+            while True:
+                try:
+                    event = subscriber.get(timeout=FEED_HEARTBEAT_SECONDS)
+                except queue.Empty:
+                    yield ': keep-alive\n\n'
+                    continue
+                if event is None:
+                    return
+                yield f"id: {event['id']}\nevent: report\ndata: {json.dumps(event)}\n\n"
+        finally:
+            report_feed.unsubscribe(subscriber)
     
-    return jsonify([{
-        'id': item.id,
-        'name': item.name,
-        'category': item.category,
-        'status': item.status,
-        'date': item.date.isoformat(),
-        'location': item.location,
-        'description': item.description,
-        'contact': item.contact,
-        'phone': item.phone,
-        'student_id': item.student_id,
-        'program': item.program,
-        'department': item.department
-    } for item in items])
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',  # stop nginx buffering the stream
+    })
+
 
 @app.route('/api/items', methods=['GET', 'POST'])
+@query_budget(3)
+@login_required
 def api_items():
     """API endpoint for items"""
-    if 'user_id' not in session:
-        return jsonify({'error': 'Unauthorized'}), 401
-    
     if request.method == 'GET':
-        items = Item.query.all()
-        return jsonify([{
-            'name': item.name,
-            'category': item.category,
-            'date': item.date.isoformat(),
-            'description': item.description,
-            'color': item.color,
-            'brand': item.brand,
-            'value': item.value
-        } for item in items])
+        def build_response():
+            try:
+                fields = fields_from_args(request.args, ITEM_FIELDS)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            query = db.select(*columns_for(Item, fields)).order_by(Item.name)
+            items = response_cache.get_or_compute(
+                cache_key(require_admin()),
+                lambda: [serialize_row(row, fields) for row in db.session.execute(query)]
+            )
+            return jsonify(items)
+        
+        return conditional_api_response(Item.__table__.name, build_response)
     
     elif request.method == 'POST':
         data = request.json
@@ -927,34 +3420,67 @@ def api_items():
         return jsonify({'success': True, 'name': new_item.name}), 201
 
 
+def copy_item_to_reports(item, old_category):
+    """Update the name and category copied onto an item's reports, in the current transaction
+
+    Reports keep these copies for search and listing, so renaming an item is one
+    UPDATE of its reports (found through the item_id index) that commits or rolls
+    back with the item.
+    """
+    result = db.session.execute(
+        db.update(LostFoundItem).where(LostFoundItem.item_id == item.id)
+        .values(name=item.name, category=item.category, updated_at=datetime.utcnow()),
+        execution_options={'synchronize_session': False}
+    )
+    # Bulk updates skip the flush hooks, so keep the counters and table version current here
+    if item.category != old_category and result.rowcount:
+        apply_stat_counter_deltas(db.session.connection(), {
+            ('reports_by_category', old_category): -result.rowcount,
+            ('reports_by_category', item.category): result.rowcount,
+        })
+    bump_table_versions(db.session.connection(), {LostFoundItem.__table__.name})
+
+
 @app.route('/api/items/<item_name>', methods=['GET', 'PUT', 'DELETE'])
+@query_budget(2)
+@login_required
 def api_item(item_name):
-    """API endpoint for single item (using name as primary key)"""
-    if 'user_id' not in session:
-        return jsonify({'error': 'Unauthorized'}), 401
-    
-    item = Item.query.get_or_404(item_name)
-    
+    """API endpoint for single item, looked up by its unique name"""
     if request.method == 'GET':
-        return jsonify({
-            'name': item.name,
-            'category': item.category,
-            'date': item.date.isoformat(),
-            'description': item.description,
-            'color': item.color,
-            'brand': item.brand,
-            'value': item.value
-        })
+        try:
+            fields = fields_from_args(request.args, ITEM_FIELDS)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        row = db.session.execute(
+            db.select(*columns_for(Item, fields)).where(Item.name == item_name)
+        ).first()
+        if row is None:
+            abort(404)
+        return jsonify(serialize_row(row, fields))
+    
+    item = Item.query.filter_by(name=item_name).first_or_404()
     
-    elif request.method == 'PUT':
+    if request.method == 'PUT':
         data = request.json
+        old_name, old_category = item.name, item.category
+        if 'name' in data:
+            new_name = str(data['name'] or '').strip()
+            if not new_name or len(new_name) > 200:
+                return jsonify({'error': 'name must be 1 to 200 characters'}), 400
+            if new_name != old_name and Item.query.filter_by(name=new_name).first():
+                return jsonify({'error': f'An item named "{new_name}" already exists'}), 409
+            item.name = new_name
         item.category = data.get('category', item.category)
         item.date = datetime.strptime(data.get('date', item.date.isoformat()), '%Y-%m-%d').date() if data.get('date') else item.date
         item.description = data.get('description', item.description)
         item.color = data.get('color', item.color)
         item.brand = data.get('brand', item.brand)
         item.value = data.get('value', item.value)
+        if (item.name, item.category) != (old_name, old_category):
+            copy_item_to_reports(item, old_category)
         db.session.commit()
+        if item.name != old_name:
+            search_backend.invalidate()
         return jsonify({'success': True})
     
     elif request.method == 'DELETE':
@@ -963,26 +3489,536 @@ def api_item(item_name):
         return jsonify({'success': True})
 
 
+@app.route('/api/import/<kind>', methods=['POST'])
+@login_required
+def api_import(kind):
+    """API endpoint for bulk importing items or lost/found reports (Admin only)
+
+    The request body is streamed as CSV (text/csv) or NDJSON (application/x-ndjson),
+    or as given by the format query parameter.
+    """
+    if not require_admin():
+        return jsonify({'error': 'Admin privileges required'}), 403
+    if kind not in IMPORT_KINDS:
+        return jsonify({'error': f"Unknown import kind '{kind}'"}), 404
+    
+    data_format = request.args.get('format') or ('csv' if request.mimetype == 'text/csv' else 'ndjson')
+    if data_format not in ('csv', 'ndjson'):
+        return jsonify({'error': "format must be 'csv' or 'ndjson'"}), 400
+    
+    stream = io.TextIOWrapper(request.stream, encoding='utf-8', newline='')
+    result = import_records(kind, iter_import_records(stream, data_format))
+    return jsonify(result)
+
+
+@app.route('/api/cache/stats')
+@query_budget(1)
+@login_required
+def api_cache_stats():
+    """API endpoint for response cache hit ratio (Admin only)"""
+    if not require_admin():
+        return jsonify({'error': 'Admin privileges required'}), 403
+    
+    return jsonify(response_cache.stats())
+
+
+@app.route('/metrics')
+@query_budget(1)
+def metrics():
+    """Prometheus metrics for this worker (Admin only, or a scraper sending METRICS_TOKEN)"""
+    token = os.getenv('METRICS_TOKEN')
+    if not (token and hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}')):
+        if 'user_id' not in session:
+            return jsonify({'error': 'Unauthorized'}), 401
+        if not require_admin():
+            return jsonify({'error': 'Admin privileges required'}), 403
+    
+    return Response(render_metrics(), mimetype='text/plain; version=0.0.4')
+
+
+@app.route('/api/tasks/stats')
+@query_budget(4)
+@login_required
+def api_task_stats():
+    """API endpoint for background task queue depth and latency (Admin only)"""
+    if not require_admin():
+        return jsonify({'error': 'Admin privileges required'}), 403
+    
+    return jsonify(task_stats())
+
+
+@app.route('/api/dashboard')
+@query_budget(4)
+@login_required
+def api_dashboard():
+    """API endpoint for the dashboard grids and headline counts in one response"""
+    limit = request.args.get('limit', DASHBOARD_GRID_SIZE, type=int)
+    limit = max(1, min(limit, DASHBOARD_MAX_GRID_SIZE))
+    
+    data = response_cache.get_or_compute(cache_key(False), lambda: load_dashboard_grids(limit))
+    return jsonify(data)
+
+
 @app.route('/api/stats')
+@query_budget(2)
+@login_required
 def api_stats():
     """API endpoint for dashboard statistics"""
-    if 'user_id' not in session:
-        return jsonify({'error': 'Unauthorized'}), 401
-    
-    total_items = Item.query.count()
+    stats = get_stats()
     
     return jsonify({
-        'total_items': total_items,
-        'lost_items': 0,  # Status field removed
-        'found_items': 0  # Status field removed
+        'total_items': stats['total_items'],
+        'lost_items': stats['lost_items'],
+        'found_items': stats['found_items']
     })
 
 
+# Schema migrations
+# Advisory lock key held while migrating, so workers starting together do not race
+MIGRATION_LOCK_ID = 7201301
+
+
+def create_indexes(*names):
+    """Migration step that creates model-declared indexes missing from an existing database"""
+    def migrate(connection):
+        for table in db.metadata.sorted_tables:
+            for index in table.indexes:
+                if index.name in names:
+                    index.create(bind=connection, checkfirst=True)
+    return migrate
+
+
+def use_item_surrogate_key(connection):
+    """Migration step moving item from a name primary key to an integer id
+
+    Reports get an item_id foreign key filled in from their item name; the
+    name stays unique on item and is kept on reports for search and sorting.
+    """
+    columns = {table: {column['name'] for column in db.inspect(connection).get_columns(table)}
+               for table in ('item', 'lost_found_item')}
+    if 'id' not in columns['item']:
+        foreign_keys = connection.execute(db.text(
+            "SELECT conname FROM pg_constraint WHERE contype = 'f' "
+            "AND conrelid = 'lost_found_item'::regclass AND confrelid = 'item'::regclass"
+        )).scalars().all()
+        for name in foreign_keys:
+            connection.execute(db.text(f'ALTER TABLE lost_found_item DROP CONSTRAINT {name}'))
+        connection.execute(db.text('ALTER TABLE item DROP CONSTRAINT item_pkey'))
+        connection.execute(db.text('ALTER TABLE item ADD COLUMN id SERIAL PRIMARY KEY'))
+        connection.execute(db.text('CREATE UNIQUE INDEX ix_item_name ON item (name)'))
+    if 'item_id' not in columns['lost_found_item']:
+        connection.execute(db.text('ALTER TABLE lost_found_item ADD COLUMN item_id INTEGER'))
+        connection.execute(db.text(
+            'UPDATE lost_found_item SET item_id = item.id FROM item WHERE item.name = lost_found_item.name'
+        ))
+        connection.execute(db.text('ALTER TABLE lost_found_item ALTER COLUMN item_id SET NOT NULL'))
+        connection.execute(db.text('ALTER TABLE lost_found_item ADD CONSTRAINT lost_found_item_item_id_fkey '
+                                   'FOREIGN KEY (item_id) REFERENCES item (id)'))
+        connection.execute(db.text('CREATE INDEX ix_lost_found_item_item_id ON lost_found_item (item_id)'))
+
+
+# Applied in order, once per database. Append new steps; never edit or renumber applied ones.
+# create_all() builds new tables with everything declared on the models, so on a fresh
+# database these steps find nothing to do and are just recorded.
+MIGRATIONS = [
+    (1, 'Index lost_found_item (category, status, date) for matching',
+     create_indexes('ix_lost_found_item_category_status_date')),
+    (2, 'Index lost_found_item (status, date), (created_at) and item (date)',
+     create_indexes('ix_lost_found_item_status_date', 'ix_lost_found_item_created_at', 'ix_item_date')),
+    (3, 'Give item an integer id and reference it from lost_found_item.item_id', use_item_surrogate_key),
+]
+
+
+def run_migrations():
+    """Apply pending MIGRATIONS, each in its own transaction; returns the names applied"""
+    SchemaMigration.__table__.create(bind=db.engine, checkfirst=True)
+    applied = []
+    for version, name, migrate in MIGRATIONS:
+        with db.engine.begin() as connection:
+            connection.execute(db.select(db.func.pg_advisory_xact_lock(MIGRATION_LOCK_ID)))
+            done = connection.execute(
+                db.select(SchemaMigration.version).where(SchemaMigration.version == version)
+            ).first()
+            if done:
+                continue
+            migrate(connection)
+            connection.execute(db.insert(SchemaMigration).values(version=version, name=name,
+                                                                  applied_at=datetime.utcnow()))
+        app.logger.info(f'Applied migration {version}: {name}')
+        applied.append((version, name))
+    return applied
+
+
+def hot_queries():
+    """The frequently run report/item queries that must be able to use an index"""
+    today = date.today()
+    search_query = build_search_query({**search_filters_from_args({}), 'status': 'lost',
+                                       'date_from': (today - timedelta(days=30)).isoformat(),
+                                       'date_to': today.isoformat()})[0]
+    return {
+        'recent reports': db.select(LostFoundItem).order_by(LostFoundItem.created_at.desc()).limit(10),
+        'recent items': db.select(Item).order_by(Item.date.desc()).limit(10),
+        'reports by status': db.select(LostFoundItem).where(LostFoundItem.status == 'lost')
+                               .order_by(LostFoundItem.date.desc()),
+        'search by status and date range': search_query.limit(SEARCH_PAGE_SIZE + 1).statement,
+        'match candidates': db.select(LostFoundItem.id).where(
+            LostFoundItem.category == 'electronics', LostFoundItem.status == 'found',
+            LostFoundItem.date >= today - timedelta(days=MATCH_WINDOW_DAYS), LostFoundItem.date <= today
+        ).order_by(LostFoundItem.date.desc()).limit(MATCH_MAX_CANDIDATES // 2),
+    }
+
+
+def sequential_scans(statement):
+    """EXPLAIN a statement and return the tables it reads with a sequential scan
+
+    Sequential scans are disabled for the EXPLAIN, so one still showing up
+    means no index can serve the query (e.g. a non-sargable predicate), not
+    just that the table is too small for an index to be worth it.
+    """
+    compiled = statement.compile(dialect=db.engine.dialect, compile_kwargs={'literal_binds': True})
+    with db.engine.begin() as connection:
+        connection.execute(db.text('SET LOCAL enable_seqscan = off'))
+        plan = connection.execute(db.text(f'EXPLAIN (FORMAT JSON) {compiled}')).scalar()
+
+    tables = []
+    nodes = [plan[0]['Plan']]
+    while nodes:
+        node = nodes.pop()
+        if node['Node Type'] == 'Seq Scan':
+            tables.append(node['Relation Name'])
+        nodes.extend(node.get('Plans', []))
+    return tables
+
+
+# Static assets
+# "flask --app app build-assets" writes a minified copy of every stylesheet and script to
+# static/dist under a name containing its content hash, plus .gz and (with the brotli
+# package) .br variants. url_for('static', ...) then points at the built copy, which is
+# served precompressed and cached as immutable for a year - an edited file gets a new
+# name, so browsers never revalidate. Without a build the source files are served as before.
+ASSET_SOURCES = ('css/*.css', 'js/*.js')
+ASSET_DIR = 'dist'
+ASSET_MAX_AGE = 365 * 24 * 3600
+ASSET_ENCODINGS = (('br', '.br'), ('gzip', '.gz'))  # in order of preference
+
+asset_manifest = {}  # source filename -> built filename, relative to the static folder
+built_assets = {}  # built filename -> encodings it has a precompressed variant for
+
+CSS_STRING = r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\''
+CSS_STRING_OR_COMMENT = re.compile(rf'({CSS_STRING})|/\*.*?\*/', re.S)
+CSS_STRING_SPLIT = re.compile(rf'({CSS_STRING})')
+
+
+def minify_css(text):
+    """Drop comments and redundant whitespace; quoted strings are left alone"""
+    text = CSS_STRING_OR_COMMENT.sub(lambda match: match.group(1) or '', text)
+    pieces = CSS_STRING_SPLIT.split(text)  # quoted strings at the odd indexes
+    for index in range(0, len(pieces), 2):
+        piece = re.sub(r'\s+', ' ', pieces[index])
+        piece = re.sub(r' ?([{};,>]) ?', r'\1', piece)
+        pieces[index] = piece.replace(': ', ':').replace(';}', '}')
+    return ''.join(pieces).strip() + '\n'
+
+
+JS_REGEX_KEYWORDS = {'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void', 'throw',
+                     'case', 'do', 'else', 'yield', 'await'}  # a / after these starts a regex literal
+
+
+def js_string_end(text, start):
+    """Index just past the quoted string starting at start"""
+    quote, position = text[start], start + 1
+    while position < len(text) and text[position] not in (quote, '\n'):
+        position += 2 if text[position] == '\\' else 1
+    return min(position + 1, len(text))
+
+
+def js_regex_end(text, start):
+    """Index just past the regex literal (including flags) starting at start"""
+    position, in_class = start + 1, False
+    while position < len(text) and text[position] != '\n':
+        char = text[position]
+        if char == '\\':
+            position += 1
+        elif char == '[':
+            in_class = True
+        elif char == ']':
+            in_class = False
+        elif char == '/' and not in_class:
+            position += 1
+            break
+        position += 1
+    while position < len(text) and (text[position].isalnum() or text[position] in '_$'):
+        position += 1
+    return position
+
+
+def js_regex_allowed(last):
+    """Whether a / after the token last starts a regex literal rather than a division"""
+    if last in JS_REGEX_KEYWORDS or not last:
+        return True
+    return not (last[-1].isalnum() or last[-1] in '_$)]}' or last in ('++', '--'))
+
+
+def minify_js(text):
+    """Drop comments and collapse whitespace outside strings, template literals and regexes
+
+    The source is scanned token by token, so quotes, backticks and slashes inside
+    any of these (or inside comments) are read the way the browser reads them.
+    Line breaks are kept, one per run of blank lines, so automatic semicolon
+    insertion sees the same statements; nothing else is rewritten. Most of the
+    saving on scripts comes from compression.
+    """
+    out = []
+    substitutions = []  # brace depth inside each open ${...} of a template literal
+    last = ''  # previous token; string, template and regex literals count as '""'
+    space = ''  # whitespace to write before the next token: '', ' ' or a line break
+    position, length = 0, len(text)
+    while position < length:
+        char = text[position]
+        if char.isspace() or text.startswith(('//', '/*'), position):
+            if char.isspace():
+                end = position
+                while end < length and text[end].isspace():
+                    end += 1
+            elif text.startswith('//', position):
+                end = text.find('\n', position)
+                end = length if end < 0 else end
+            else:
+                end = text.find('*/', position + 2)
+                end = length if end < 0 else end + 2
+            if space != '\n':
+                space = '\n' if '\n' in text[position:end] else ' '
+            position = end
+            continue
+
+        if space and out:
+            out.append(space)
+        space = ''
+        if char in '"\'':
+            end, last = js_string_end(text, position), '""'
+        elif char == '`' or (char == '}' and substitutions and substitutions[-1] == 0):
+            # A template literal, or the rest of one after a ${...} substitution
+            if char == '}':
+                substitutions.pop()
+            end = position + 1
+            while end < length and text[end] != '`' and not text.startswith('${', end):
+                end += 2 if text[end] == '\\' else 1
+            if text.startswith('${', end):
+                end, last = end + 2, '('
+                substitutions.append(0)
+            else:
+                end, last = end + 1, '""'
+            end = min(end, length)
+        elif char == '/' and js_regex_allowed(last):
+            end, last = js_regex_end(text, position), '""'
+        elif char.isalnum() or char in '_$':
+            end = position
+            while end < length and (text[end].isalnum() or text[end] in '_$'):
+                end += 1
+            last = text[position:end]
+        elif text.startswith(('++', '--'), position):
+            end = position + 2
+            last = text[position:end]
+        else:
+            if substitutions and char in '{}':
+                substitutions[-1] += 1 if char == '{' else -1
+            end, last = position + 1, char
+        out.append(text[position:end])
+        position = end
+    return ''.join(out) + '\n'
+
+
+ASSET_MINIFIERS = {'.css': minify_css, '.js': minify_js}
+
+
+def build_assets():
+    """Minify, fingerprint and precompress ASSET_SOURCES into static/dist; returns the manifest
+
+    Earlier builds are left in place, so pages rendered by workers still running the
+    previous build keep loading their assets during a deploy.
+    """
+    manifest = {}
+    for pattern in ASSET_SOURCES:
+        for path in sorted(glob.glob(os.path.join(app.static_folder, pattern))):
+            source = os.path.relpath(path, app.static_folder).replace(os.sep, '/')
+            stem, extension = os.path.splitext(source)
+            with open(path, encoding='utf-8') as f:
+                content = ASSET_MINIFIERS[extension](f.read()).encode('utf-8')
+            built = f'{ASSET_DIR}/{stem}.{hashlib.sha256(content).hexdigest()[:12]}{extension}'
+            output = os.path.join(app.static_folder, built)
+            os.makedirs(os.path.dirname(output), exist_ok=True)
+            variants = {'': content, '.gz': gzip.compress(content, compresslevel=9, mtime=0)}
+            if brotli is not None:
+                variants['.br'] = brotli.compress(content, quality=11)
+            for suffix, data in variants.items():
+                with open(output + suffix, 'wb') as f:
+                    f.write(data)
+            manifest[source] = built
+
+    with open(os.path.join(app.static_folder, ASSET_DIR, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    load_asset_manifest()
+    return manifest
+
+
+def load_asset_manifest():
+    """Use the last build-assets output, if there is one"""
+    manifest_path = os.path.join(app.static_folder, ASSET_DIR, 'manifest.json')
+    try:
+        with open(manifest_path, encoding='utf-8') as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        manifest = {}
+
+    built = {}
+    for name in manifest.values():
+        path = os.path.join(app.static_folder, name)
+        built[name] = tuple(encoding for encoding, suffix in ASSET_ENCODINGS if os.path.isfile(path + suffix))
+    built_at = os.path.getmtime(manifest_path) if manifest else 0
+    stale = [source for source in manifest if not os.path.isfile(os.path.join(app.static_folder, source))
+             or os.path.getmtime(os.path.join(app.static_folder, source)) > built_at]
+    if stale:
+        app.logger.warning(f'Static files edited since the last build-assets: {", ".join(stale)}')
+
+    asset_manifest.clear()
+    asset_manifest.update(manifest)
+    built_assets.clear()
+    built_assets.update(built)
+
+
+@app.url_defaults
+def fingerprint_static_url(endpoint, values):
+    if endpoint == 'static' and values.get('filename') in asset_manifest:
+        values['filename'] = asset_manifest[values['filename']]
+
+
+def send_static_asset(filename):
+    """Serve a static file; built assets go out precompressed when accepted and cached as immutable"""
+    encodings = built_assets.get(filename)
+    if encodings is None:
+        return app.send_static_file(filename)
+
+    suffix = ''
+    for encoding in encodings:
+        if request.accept_encodings[encoding]:
+            suffix = dict(ASSET_ENCODINGS)[encoding]
+            break
+    response = send_from_directory(app.static_folder, filename + suffix, max_age=ASSET_MAX_AGE,
+                                   mimetype=mimetypes.guess_type(filename)[0],
+                                   download_name=os.path.basename(filename))
+    if suffix:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    response.cache_control.immutable = True
+    return response
+
+
+app.view_functions['static'] = send_static_asset
+
+
+# Application setup
+# create_app() binds the extensions and prepares the templates but opens no database
+# connection, so gunicorn --preload can import the app once in the master process and
+# fork workers from it. Each worker opens its own connections on its first query.
+TEMPLATE_CACHE_DIR = os.getenv('TEMPLATE_CACHE_DIR')  # compiled templates; default is a temp directory
+
+
+def dispose_inherited_connections():
+    """After a fork, drop pooled connections copied from the parent without closing the parent's sockets"""
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+
+
+def warm_templates():
+    """Compile every template up front (or load it from the bytecode cache) instead of on first render"""
+    for name in app.jinja_env.list_templates(extensions=('html',)):
+        try:
+            app.jinja_env.get_template(name)
+        except Exception as e:
+            # Not fatal: the template is compiled again (and the error raised) when first rendered
+            app.logger.warning(f'Template warm-up failed for {name}: {str(e)}')
+
+
+def configured_worker_count():
+    """How many worker processes gunicorn was told to start (1 when not running under gunicorn)
+
+    gunicorn defaults to WEB_CONCURRENCY, and -w/--workers in GUNICORN_CMD_ARGS or on
+    its command line override that. A worker count set in a config file is not seen.
+    """
+    if os.path.basename(sys.argv[0]) != 'gunicorn':
+        return 1
+    count = os.getenv('WEB_CONCURRENCY', '1')
+    args = shlex.split(os.getenv('GUNICORN_CMD_ARGS', '')) + sys.argv[1:]
+    for index, arg in enumerate(args):
+        if arg in ('-w', '--workers') and index + 1 < len(args):
+            count = args[index + 1]
+        elif arg.startswith('--workers='):
+            count = arg.split('=', 1)[1]
+        elif arg.startswith('-w') and arg[2:].isdigit():
+            count = arg[2:]
+    try:
+        return int(count)
+    except ValueError:
+        return 1
+
+
+def create_app():
+    """Configure the application and return it; later calls return it unchanged
+
+    Schema setup is not done here - run "flask --app app init-db".
+    """
+    if 'sqlalchemy' in app.extensions:
+        return app
+    app.config['SQLALCHEMY_DATABASE_URI'] = database_url_from_env()
+    binds = {}
+    if replica_url:
+        binds['replica'] = replica_url
+    if LISTEN_DATABASE_URL:
+        # Listeners detach their connections from the pool, so it stays small
+        binds['listen'] = {'url': LISTEN_DATABASE_URL, 'pool_size': 1, 'max_overflow': 2}
+    if binds:
+        app.config['SQLALCHEMY_BINDS'] = binds
+    db.init_app(app)
+    if DB_PGBOUNCER and not LISTEN_DATABASE_URL:
+        if feed_broker.name == 'postgres':
+            app.logger.warning('FEED_BACKEND=postgres cannot LISTEN through PgBouncer; '
+                               'set LISTEN_DATABASE_URL to connect to PostgreSQL directly')
+        if background_tasks_enabled():
+            app.logger.warning('The task worker cannot LISTEN through PgBouncer and will only poll; '
+                               'set LISTEN_DATABASE_URL to connect to PostgreSQL directly')
+    if orjson is None and os.getenv('JSON_PROVIDER', 'orjson') == 'orjson':
+        app.logger.warning('orjson is not installed, so JSON responses use the slower default encoder; '
+                           'pip install -r requirements.txt, or set JSON_PROVIDER=default')
+    if search_backend.name == 'memory' and configured_worker_count() > 1:
+        app.logger.warning('SEARCH_BACKEND=memory keeps a separate index in each worker, so searches miss '
+                           "other workers' writes; use SEARCH_BACKEND=postgres with more than one worker")
+    os.register_at_fork(after_in_child=dispose_inherited_connections)
+
+    load_asset_manifest()
+    cache_dir = TEMPLATE_CACHE_DIR
+    if cache_dir:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+        except OSError as e:
+            app.logger.warning(f'Cannot use TEMPLATE_CACHE_DIR, using a temp directory: {str(e)}')
+            cache_dir = None
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache(cache_dir)
+    warm_templates()
+    return app
+
+
 # Initialize database
 def init_db():
     """Create database tables and initialize with default data"""
     with app.app_context():
         db.create_all()
+        run_migrations()
+        search_backend.setup()
+        
+        # Backfill the statistics counters the first time they are created
+        if not StatCounter.query.first():
+            rebuild_stat_counters()
         
         # Create default users if they don't exist
         if User.query.count() == 0:
@@ -1025,8 +4061,132 @@ def init_db():
         # Sample items creation removed - items will be created manually through the form
 
 
-if __name__ == '__main__':
+@app.cli.command('init-db')
+def init_db_command():
+    """Create the tables, apply migrations and add the default users"""
     init_db()
+    click.echo('Database initialized.')
+
+
+@app.cli.command('migrate-db')
+def migrate_db_command():
+    """Create missing tables and apply pending schema migrations"""
+    db.create_all()
+    applied = run_migrations()
+    for version, name in applied:
+        click.echo(f'Applied {version}: {name}')
+    if not applied:
+        click.echo('Database schema is up to date.')
+
+
+@app.cli.command('check-indexes')
+def check_indexes_command():
+    """EXPLAIN the hot queries and fail if any of them needs a sequential scan"""
+    failures = 0
+    for name, statement in hot_queries().items():
+        tables = sequential_scans(statement)
+        if tables:
+            failures += 1
+            click.echo(f'FAIL {name}: sequential scan on {", ".join(tables)}')
+        else:
+            click.echo(f'ok   {name}')
+    if failures:
+        raise SystemExit(1)
+
+
+@app.cli.command('check-query-budgets')
+def check_query_budgets_command():
+    """Request every page and API with a query budget as an admin; fail on budget or N+1 violations"""
+    app.testing = True
+    admin = User.query.filter_by(is_admin=True).first()
+    if admin is None:
+        raise click.ClickException('No admin user to make the requests as')
+    
+    client = app.test_client()
+    with client.session_transaction() as client_session:
+        client_session.update(user_id=admin.id, username=admin.username,
+                              is_admin=True, admin_checked_at=int(time.time()))
+    
+    failures = 0
+    for rule, url in query_budget_urls():
+        if url is None:
+            click.echo(f'skip {rule.rule} (no data for its URL)')
+            continue
+        response_cache.invalidate()  # measure the uncached path
+        try:
+            response = client.get(url)
+            click.echo(f'ok   {url} ({response.status_code})')
+        except QueryBudgetExceeded as e:
+            failures += 1
+            click.echo(f'FAIL {e}')
+    if failures:
+        raise SystemExit(1)
+
+
+@app.cli.command('import-data')
+@click.argument('kind', type=click.Choice(IMPORT_KINDS))
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'data_format', type=click.Choice(['csv', 'ndjson']),
+              help='Input format (defaults to the file extension).')
+@click.option('--batch-size', type=int, default=None, help='Rows per INSERT/commit.')
+def import_data_command(kind, path, data_format, batch_size):
+    """Bulk import items or lost/found reports from a CSV or NDJSON file"""
+    data_format = data_format or ('csv' if path.lower().endswith('.csv') else 'ndjson')
+    with open(path, encoding='utf-8', newline='') as stream:
+        result = import_records(kind, iter_import_records(stream, data_format), batch_size)
+    for error in result['errors']:
+        print(f"Row {error['row']}: {error['error']}")
+    print(f"Imported {result['imported']} {kind}, {result['error_count']} rows rejected")
+
+
+@app.cli.command('seed')
+@click.option('--items', type=int, default=1000, show_default=True, help='Catalogue items to generate.')
+@click.option('--reports', type=int, default=10000, show_default=True, help='Lost/found reports to generate.')
+@click.option('--users', type=int, default=100, show_default=True, help='Users to generate.')
+@click.option('--seed', type=int, default=0, show_default=True, help='Random seed; the same seed gives the same data.')
+def seed_command(items, reports, users, seed):
+    """Load a synthetic dataset for scale testing"""
+    started = time.perf_counter()
+    try:
+        counts = seed_database(items=items, reports=reports, users=users, seed=seed)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    print(f"Loaded {counts.get('items', 0)} items, {counts.get('reports', 0)} reports and "
+          f"{counts.get('users', 0)} users in {time.perf_counter() - started:.1f}s")
+
+
+@app.cli.command('run-worker')
+@click.option('--threads', type=int, default=4, show_default=True, help='Tasks run at the same time.')
+def run_worker_command(threads):
+    """Run queued background tasks until stopped (needs BACKGROUND_TASKS=true on the web app)"""
+    print(f'Running background tasks on {threads} threads ({", ".join(sorted(TASK_HANDLERS))})')
+    TaskWorker(threads).run()
+
+
+@app.cli.command('build-assets')
+def build_assets_command():
+    """Minify, fingerprint and precompress the stylesheets and scripts into static/dist"""
+    manifest = build_assets()
+    for source, built in sorted(manifest.items()):
+        sizes = [os.path.getsize(os.path.join(app.static_folder, name))
+                 for name in (source, built, built + '.gz')]
+        click.echo(f'{source} -> {built} ({sizes[0]:,} -> {sizes[1]:,} bytes, {sizes[2]:,} gzipped)')
+    if brotli is None:
+        click.echo('brotli is not installed; wrote gzip variants only (pip install brotli)')
+
+
+@app.cli.command('rebuild-stats')
+def rebuild_stats_command():
+    """Recompute the dashboard statistics counters from the data tables"""
+    rebuild_stat_counters()
+    print("Statistics counters rebuilt successfully!")
+
+
+# WSGI entry point: gunicorn app:app (or 'app:create_app()')
+app = create_app()
+
+
+if __name__ == '__main__':
     # Use PORT environment variable if available (for production)
     port = int(os.environ.get('PORT', 5000))
     # Only enable debug in development
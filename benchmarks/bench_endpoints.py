@@ -0,0 +1,360 @@
+"""Benchmark: throughput and latency of the hot endpoints at increasing dataset sizes
+
+For each dataset size the database is filled with synthetic reports, the app
+is started under gunicorn, and each endpoint is driven by concurrent
+logged-in clients for a fixed time. Reports throughput and p50/p95/p99
+latency per endpoint; results can be saved as a JSON baseline and later runs
+compared against it.
+
+Runs against the database in DATABASE_URL (or DB_*), which should be a
+scratch database: synthetic rows are named "Bench ..." and deleted afterwards
+unless --keep is given. A throwaway local Postgres works well, e.g.
+`createdb lost_found_bench`.
+
+Usage:
+    python benchmarks/bench_endpoints.py --sizes 1000,100000,1000000 --save benchmarks/baseline.json
+    python benchmarks/bench_endpoints.py --sizes 1000,100000 --compare benchmarks/baseline.json
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from datetime import date, datetime, timedelta
+from urllib.parse import urlencode, urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app import app, db, init_db, rebuild_stat_counters, search_backend, Item, LostFoundItem  # noqa: E402
+
+THINGS = {
+    'Laptop': 'electronics', 'Phone': 'electronics', 'Headphones': 'electronics', 'Calculator': 'electronics',
+    'Wallet': 'other', 'Backpack': 'other', 'Umbrella': 'other', 'Keys': 'keys', 'Watch': 'jewelry',
+    'Jacket': 'clothing', 'Student Card': 'documents', 'Notebook': 'other',
+}
+COLOURS = ['Black', 'Blue', 'Red', 'Silver', 'Green']
+BENCH_ITEMS = [(f'Bench {colour} {thing}', category) for thing, category in THINGS.items() for colour in COLOURS]
+SEARCH_TERMS = ['laptop', 'wallet', 'blue', 'keys', 'library', 'phone black', 'umbrella', 'card']
+PERCENTILES = (50, 95, 99)
+
+INSERT_REPORTS = """
+INSERT INTO lost_found_item
+    (item_id, name, category, date, location, description, contact, status, created_at, updated_at)
+SELECT item_ids[1 + n % cardinality(names)],
+       names[1 + n % cardinality(names)],
+       categories[1 + n % cardinality(categories)],
+       CURRENT_DATE - (n % 365),
+       (ARRAY['Library', 'Cafeteria', 'Gym', 'Lecture Hall', 'Parking Lot'])[1 + n % 5] || ' ' || (n % 9),
+       'Left near the ' || (ARRAY['entrance', 'stairs', 'lift', 'desk'])[1 + n % 4] || ', report ' || n,
+       'bench' || (n % 1000) || '@example.com',
+       CASE WHEN n % 2 = 0 THEN 'lost' ELSE 'found' END,
+       now() - make_interval(secs => n), now()
+FROM generate_series(:start, :stop - 1) AS n,
+     (SELECT CAST(:item_ids AS integer[]) AS item_ids, CAST(:names AS text[]) AS names,
+             CAST(:categories AS text[]) AS categories) AS vocabulary
+"""
+
+
+# Dataset
+def seed_reports(target):
+    """Top up the synthetic reports to `target` rows and refresh the derived data"""
+    with app.app_context():
+        for name, category in BENCH_ITEMS:
+            if Item.query.filter_by(name=name).first() is None:
+                db.session.add(Item(name=name, category=category, date=date.today(), description='Benchmark item'))
+        db.session.commit()
+        item_ids = dict(db.session.execute(db.select(Item.name, Item.id).where(Item.name.like('Bench %'))).all())
+
+        existing = LostFoundItem.query.filter(LostFoundItem.name.like('Bench %')).count()
+        if existing < target:
+            db.session.execute(db.text(INSERT_REPORTS), {
+                'start': existing, 'stop': target,
+                'item_ids': [item_ids[name] for name, _ in BENCH_ITEMS],
+                'names': [name for name, _ in BENCH_ITEMS],
+                'categories': [category for _, category in BENCH_ITEMS],
+            })
+            db.session.commit()
+        db.session.execute(db.text('ANALYZE lost_found_item'))
+        # Raw INSERTs bypass the ORM hooks that keep these up to date
+        rebuild_stat_counters()
+        search_backend.invalidate()
+
+
+def remove_bench_data():
+    with app.app_context():
+        LostFoundItem.query.filter(LostFoundItem.name.like('Bench %')).delete(synchronize_session=False)
+        Item.query.filter(Item.name.like('Bench %')).delete(synchronize_session=False)
+        db.session.commit()
+        rebuild_stat_counters()
+
+
+# Server
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workers, threads):
+    """Run the app under gunicorn and wait until it answers"""
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '--workers', str(workers), '--threads', str(threads),
+         '--bind', f'127.0.0.1:{port}', '--log-level', 'warning', 'app:app'],
+        cwd=ROOT
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=2)
+            connection.request('GET', '/login')
+            connection.getresponse().read()
+            return server, f'http://127.0.0.1:{port}'
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError('gunicorn did not start within 30s')
+
+
+# Client
+class Client:
+    """One keep-alive HTTP connection with its own session cookie"""
+
+    def __init__(self, base_url):
+        parts = urlsplit(base_url)
+        self.connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=60)
+        self.cookie = None
+
+    def request(self, method, path, form=None, headers=None):
+        headers = dict(headers or {})
+        body = None
+        if form is not None:
+            body = urlencode(form)
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        if self.cookie:
+            headers['Cookie'] = self.cookie
+        try:
+            self.connection.request(method, path, body=body, headers=headers)
+            response = self.connection.getresponse()
+        except (http.client.HTTPException, OSError):
+            # gunicorn closed the keep-alive connection; retry once on a new one
+            self.connection.close()
+            self.connection.request(method, path, body=body, headers=headers)
+            response = self.connection.getresponse()
+        response.read()
+        set_cookie = response.getheader('Set-Cookie')
+        if set_cookie and set_cookie.startswith('session='):
+            self.cookie = set_cookie.split(';', 1)[0]
+        return response.status
+
+    def login(self, username, password):
+        status = self.request('POST', '/login', form={'username': username, 'password': password},
+                              headers={'X-Requested-With': 'XMLHttpRequest'})
+        if status != 200 or not self.cookie:
+            raise RuntimeError(f'Login as {username} failed with HTTP {status}')
+
+
+def scenarios(username, password):
+    """Endpoint name -> function(client, rng) making one request and returning its status"""
+    def login(client, rng):
+        client.cookie = None
+        return client.request('POST', '/login', form={'username': username, 'password': password},
+                              headers={'X-Requested-With': 'XMLHttpRequest'})
+
+    def search_page(client, rng):
+        return client.request('GET', '/search?' + urlencode({'q': rng.choice(SEARCH_TERMS)}))
+
+    def api_search(client, rng):
+        params = rng.choice([{'q': rng.choice(SEARCH_TERMS)}, {'status': rng.choice(['lost', 'found'])},
+                             {'q': rng.choice(SEARCH_TERMS), 'sort': 'date-desc'}])
+        return client.request('GET', '/api/search?' + urlencode(params))
+
+    def report_post(client, rng):
+        name = rng.choice(BENCH_ITEMS)[0]
+        day = (date.today() - timedelta(days=rng.randrange(30))).isoformat()
+        return client.request('POST', '/report', form={
+            'form_type': 'lost', 'item-name': name, 'date-lost': day, 'location': 'Library 3',
+            'description': f'{name} left near the desk', 'contact': 'bench@example.com',
+        })
+
+    return {
+        'POST /login': login,
+        'GET /dashboard': lambda client, rng: client.request('GET', '/dashboard'),
+        'GET /search': search_page,
+        'GET /api/search': api_search,
+        'POST /report': report_post,
+        'GET /api/items': lambda client, rng: client.request('GET', '/api/items'),
+    }
+
+
+def run_scenario(base_url, scenario, concurrency, duration, username, password):
+    """Drive one endpoint with `concurrency` clients for `duration` seconds"""
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    start = threading.Barrier(concurrency + 1)
+    stop_at = float('inf')  # set once every client is logged in and warmed up
+    setup_errors = []
+
+    def worker(seed):
+        rng = random.Random(seed)
+        try:
+            client = Client(base_url)
+            client.login(username, password)
+            for _ in range(3):  # warm up the connection and the worker
+                scenario(client, rng)
+        except Exception as e:
+            setup_errors.append(e)
+            start.abort()  # release the other clients and the main thread
+            return
+        try:
+            start.wait()
+        except threading.BrokenBarrierError:
+            return
+        timings, failed = [], 0
+        while time.monotonic() < stop_at:
+            started = time.perf_counter()
+            status = scenario(client, rng)
+            timings.append(time.perf_counter() - started)
+            if status >= 400:
+                failed += 1
+        with lock:
+            latencies.extend(timings)
+            errors.append(failed)
+
+    threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    try:
+        start.wait()
+    except threading.BrokenBarrierError:
+        for thread in threads:
+            thread.join()
+        raise RuntimeError(f'A client failed to log in or warm up: {setup_errors[0]!r}') from setup_errors[0]
+    began = time.monotonic()
+    stop_at = began + duration
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - began
+
+    ordered = sorted(latencies)
+    result = {
+        'requests': len(ordered),
+        'errors': sum(errors),
+        'throughput_rps': round(len(ordered) / elapsed, 1),
+    }
+    for pct in PERCENTILES:
+        index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        result[f'p{pct}_ms'] = round(ordered[index] * 1000, 2) if ordered else None
+    result['mean_ms'] = round(statistics.fmean(ordered) * 1000, 2) if ordered else None
+    return result
+
+
+# Reporting
+def print_results(size, results, baseline=None):
+    print(f'\n{size:,} reports')
+    print(f"  {'endpoint':<18}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for name, result in results.items():
+        line = (f"  {name:<18}{result['throughput_rps']:>9.1f}{result['p50_ms']:>10.2f}"
+                f"{result['p95_ms']:>10.2f}{result['p99_ms']:>10.2f}{result['errors']:>8}")
+        previous = (baseline or {}).get(name)
+        if previous and previous.get('p95_ms'):
+            change = (result['p95_ms'] - previous['p95_ms']) / previous['p95_ms']
+            line += f'   p95 {change:+.0%} vs baseline'
+        print(line)
+
+
+def regressions(runs, baseline_runs, threshold):
+    """Endpoints whose p95 latency grew by more than threshold against the baseline"""
+    found = []
+    for size, results in runs.items():
+        for name, result in results.items():
+            previous = baseline_runs.get(size, {}).get(name)
+            if previous and previous.get('p95_ms') and result['p95_ms'] > previous['p95_ms'] * (1 + threshold):
+                found.append(f"{name} at {int(size):,} reports: p95 {previous['p95_ms']} -> {result['p95_ms']} ms")
+    return found
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='1000,100000',
+                        help='Comma-separated report counts to benchmark at (default: %(default)s)')
+    parser.add_argument('--endpoints', help='Comma-separated subset of endpoints, e.g. "GET /dashboard"')
+    parser.add_argument('--concurrency', type=int, default=8, help='Concurrent clients (default: %(default)s)')
+    parser.add_argument('--duration', type=float, default=10, help='Seconds per endpoint (default: %(default)s)')
+    parser.add_argument('--workers', type=int, default=2, help='gunicorn workers (default: %(default)s)')
+    parser.add_argument('--threads', type=int, default=4, help='Threads per gunicorn worker (default: %(default)s)')
+    parser.add_argument('--username', default='admin', help='User the clients log in as (default: %(default)s)')
+    parser.add_argument('--password', default='admin123')
+    parser.add_argument('--save', help='Write the results to this JSON file')
+    parser.add_argument('--compare', help='Baseline JSON file to compare p95 latency against')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='Allowed p95 growth over the baseline before failing (default: %(default)s)')
+    parser.add_argument('--keep', action='store_true', help='Leave the synthetic data in the database')
+    args = parser.parse_args()
+
+    sizes = sorted(int(size) for size in args.sizes.split(','))
+    available = scenarios(args.username, args.password)
+    selected = args.endpoints.split(',') if args.endpoints else list(available)
+    baseline_runs = {}
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline_runs = json.load(baseline_file)['runs']
+
+    init_db()
+    runs = {}
+    try:
+        for size in sizes:
+            seed_reports(size)
+            server, base_url = start_server(args.workers, args.threads)
+            try:
+                results = {name: run_scenario(base_url, available[name], args.concurrency, args.duration,
+                                              args.username, args.password)
+                           for name in selected}
+            finally:
+                server.terminate()
+                server.wait()
+            runs[str(size)] = results
+            print_results(size, results, baseline_runs.get(str(size)))
+    finally:
+        if not args.keep:
+            remove_bench_data()
+
+    if args.save:
+        with open(args.save, 'w') as output:
+            json.dump({
+                'benchmark': 'endpoints',
+                'created_at': datetime.utcnow().isoformat(timespec='seconds') + 'Z',
+                'revision': git_revision(),
+                'settings': {'concurrency': args.concurrency, 'duration': args.duration,
+                             'workers': args.workers, 'threads': args.threads},
+                'runs': runs,
+            }, output, indent=2)
+        print(f'\nSaved results to {args.save}')
+
+    if args.compare:
+        slower = regressions(runs, baseline_runs, args.threshold)
+        if slower:
+            print(f'\np95 regressions over {args.threshold:.0%}:')
+            for line in slower:
+                print(f'  {line}')
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""Benchmark: lost/found match latency as the report table grows
+
+Fills lost_found_item with synthetic reports at a constant rate per day (so a
+bigger table covers a longer period, like a real deployment), and after each
+step times find_matches() for a set of new reports. Latency should stay flat
+because candidates are read from the (category, status, date) index within a
+fixed date window.
+
+Everything runs inside one transaction that is rolled back at the end, so the
+database is left untouched.
+
+Usage:
+    python benchmarks/bench_matching.py --sizes 1000,10000,100000,1000000
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app, db, find_matches, init_db, Item, LostFoundItem  # noqa: E402
+
+CATEGORIES = ['electronics', 'jewelry', 'clothing', 'documents', 'keys', 'books', 'bags', 'watches', 'other']
+BENCH_ITEM = 'bench-matching-item'
+
+INSERT_REPORTS = """
+INSERT INTO lost_found_item
+    (item_id, name, category, date, location, description, contact, status, created_at, updated_at)
+SELECT :item_id,
+       :item,
+       (ARRAY[{categories}])[1 + n % {category_count}],
+       CURRENT_DATE - (n / :per_day),
+       'Building ' || (n % 12) || ' floor ' || (n % 7),
+       'report ' || n || ' colour ' || (ARRAY['black', 'blue', 'red', 'silver'])[1 + n % 4],
+       'bench@example.com',
+       CASE WHEN n % 2 = 0 THEN 'lost' ELSE 'found' END,
+       now(), now()
+FROM generate_series(:start, :stop - 1) AS n
+"""
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='1000,10000,100000',
+                        help='Comma-separated table sizes to measure at (default: %(default)s)')
+    parser.add_argument('--per-day', type=int, default=200,
+                        help='Synthetic reports per day across all categories (default: %(default)s)')
+    parser.add_argument('--probes', type=int, default=200,
+                        help='find_matches() calls timed at each size (default: %(default)s)')
+    parser.add_argument('--json', dest='json_path', help='Also write the results to this JSON file')
+    args = parser.parse_args()
+    sizes = sorted(int(size) for size in args.sizes.split(','))
+
+    init_db()
+    insert_sql = db.text(INSERT_REPORTS.format(
+        categories=', '.join(f"'{category}'" for category in CATEGORIES),
+        category_count=len(CATEGORIES)
+    ))
+
+    results = []
+    with app.app_context():
+        try:
+            today = db.session.execute(db.select(db.func.current_date())).scalar()
+            bench_item = Item(name=BENCH_ITEM, category='other', date=today, description='benchmark')
+            db.session.add(bench_item)
+            db.session.flush()
+
+            inserted = 0
+            for size in sizes:
+                db.session.execute(insert_sql, {'item_id': bench_item.id, 'item': BENCH_ITEM,
+                                                'per_day': args.per_day, 'start': inserted, 'stop': size})
+                inserted = size
+                db.session.execute(db.text('ANALYZE lost_found_item'))
+
+                days_covered = max(1, size // args.per_day)
+                timings = []
+                for probe in range(args.probes):
+                    report = LostFoundItem(
+                        name=BENCH_ITEM,
+                        category=CATEGORIES[probe % len(CATEGORIES)],
+                        date=today - timedelta(days=probe % days_covered),
+                        location=f'Building {probe % 12} floor {probe % 7}',
+                        description=f'lost colour {["black", "blue", "red", "silver"][probe % 4]}',
+                        status='lost' if probe % 2 else 'found',
+                    )
+                    started = time.perf_counter()
+                    find_matches(report)
+                    timings.append((time.perf_counter() - started) * 1000)
+
+                row = {
+                    'reports': size,
+                    'p50_ms': round(statistics.median(timings), 3),
+                    'p95_ms': round(percentile(timings, 95), 3),
+                    'p99_ms': round(percentile(timings, 99), 3),
+                }
+                results.append(row)
+                print(f"{size:>10,} reports  p50 {row['p50_ms']:8.3f} ms  "
+                      f"p95 {row['p95_ms']:8.3f} ms  p99 {row['p99_ms']:8.3f} ms")
+        finally:
+            db.session.rollback()
+
+    if args.json_path:
+        with open(args.json_path, 'w') as output:
+            json.dump({'benchmark': 'matching', 'per_day': args.per_day, 'results': results}, output, indent=2)
+
+
+if __name__ == '__main__':
+    main()
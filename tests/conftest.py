@@ -0,0 +1,70 @@
+"""Fixtures for tests that need the app and a PostgreSQL database
+
+Set TEST_DATABASE_URL to a PostgreSQL database the tests may write to; it is
+brought up to date with init_db() first. Without it these tests are skipped,
+and DATABASE_URL is never used, so a development database is not touched.
+Tests of pure functions use app_module and run without a database.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+TEST_DATABASE_URL = os.getenv('TEST_DATABASE_URL')
+
+
+@pytest.fixture(scope='session')
+def app_module():
+    """The app module; importing it opens no database connection, so this needs no database"""
+    os.environ['DATABASE_URL'] = TEST_DATABASE_URL or 'postgresql://unit-tests.invalid/lost_found'
+    os.environ.pop('DATABASE_REPLICA_URL', None)
+
+    import app as module
+    return module
+
+
+@pytest.fixture(scope='session')
+def app(app_module):
+    if not TEST_DATABASE_URL:
+        pytest.skip('TEST_DATABASE_URL is not set')
+
+    flask_app, init_db = app_module.app, app_module.init_db
+    init_db()
+    flask_app.testing = True
+    with flask_app.app_context():
+        yield flask_app
+
+
+@pytest.fixture(scope='session')
+def sample_report(app):
+    """A catalogue item and one report of it, so routes with an id or name in the URL can be requested"""
+    from datetime import date
+    from app import db, Item, LostFoundItem
+
+    item = Item.query.filter_by(name='Test umbrella').first()
+    if item is None:
+        item = Item(name='Test umbrella', category='other', date=date.today(), description='Black, folding')
+        db.session.add(item)
+        db.session.flush()
+        db.session.add(LostFoundItem(item_id=item.id, name=item.name, category=item.category, date=date.today(),
+                                     location='Library', description='Left on a desk', contact='test@bubt.edu.bd',
+                                     status='lost'))
+        db.session.commit()
+    return item
+
+
+@pytest.fixture
+def admin_client(app):
+    """Test client logged in as the default admin; with app.testing set, a request over its
+    query budget raises QueryBudgetExceeded"""
+    import time
+    from app import User
+
+    admin = User.query.filter_by(is_admin=True).first()
+    client = app.test_client()
+    with client.session_transaction() as client_session:
+        client_session.update(user_id=admin.id, username=admin.username,
+                              is_admin=True, admin_checked_at=int(time.time()))
+    return client
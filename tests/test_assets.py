@@ -0,0 +1,71 @@
+"""The asset minifiers must leave strings, template literals and regexes exactly as written"""
+import pytest
+
+
+@pytest.fixture(scope='module')
+def minify_js(app_module):
+    return app_module.minify_js
+
+
+@pytest.fixture(scope='module')
+def minify_css(app_module):
+    return app_module.minify_css
+
+
+def test_js_drops_comments_and_indentation(minify_js):
+    source = 'function f() {\n    // explain\n    return 1;  /* trailing */\n}\n\n\nf();\n'
+    assert minify_js(source) == 'function f() {\nreturn 1;\n}\nf();\n'
+
+
+def test_js_keeps_line_breaks_between_statements(minify_js):
+    assert minify_js('a = b\n/* one\ntwo */\nc()') == 'a = b\nc()\n'
+
+
+def test_js_template_literal_is_kept_verbatim(minify_js):
+    source = 'const html = `<p>\n    // not a comment\n</p>`;\n  done();'
+    assert minify_js(source) == 'const html = `<p>\n    // not a comment\n</p>`;\ndone();\n'
+
+
+@pytest.mark.parametrize('source, expected', [
+    ('const t = `a \\` b  // inside`;\n  x();', 'const t = `a \\` b  // inside`;\nx();\n'),
+    ("const s = 'a ` b';\n  const t = `  kept  `;", "const s = 'a ` b';\nconst t = `  kept  `;\n"),
+    ('const r = /`/;\n  const t = `  kept  `;', 'const r = /`/;\nconst t = `  kept  `;\n'),
+    ('// a stray ` here\n  const t = `  kept  `;', 'const t = `  kept  `;\n'),
+    ('/* and ` here */ const t = `  kept  `;', 'const t = `  kept  `;\n'),
+])
+def test_js_backticks_outside_template_literals_do_not_flip_state(minify_js, source, expected):
+    assert minify_js(source) == expected
+
+
+def test_js_nested_template_substitutions(minify_js):
+    source = 'const h = `<ul>${items.map(i => `<li class="${i.cls}">  ${i}  </li>`).join(\'\')}</ul>`;'
+    assert minify_js(source) == source + '\n'
+
+
+def test_js_strings_keep_comment_markers_and_spaces(minify_js):
+    source = 'const url = "http://example.com/*x*/";   const s = \'it\\\'s  //  fine\';'
+    assert minify_js(source) == 'const url = "http://example.com/*x*/"; const s = \'it\\\'s  //  fine\';\n'
+
+
+@pytest.mark.parametrize('source', [
+    'const re = /\\/\\/  [/]  /g;',
+    'if (ok) return /a  b/.test(x);',
+    'const parts = text.split(/,  */);',
+])
+def test_js_regex_literals_are_kept_verbatim(minify_js, source):
+    assert minify_js(source) == source + '\n'
+
+
+@pytest.mark.parametrize('source', ['x = a / b / c;', 'x = (a) / 2 / (b);', 'x = i++ / 2;', 'x = a[0] / b[1];'])
+def test_js_division_is_not_read_as_a_regex(minify_js, source):
+    assert minify_js(source) == source + '\n'
+
+
+def test_js_minify_is_stable(minify_js):
+    source = 'let a = `x ${"}"} y`;\n// c\nlet b = /}/g;\n'
+    assert minify_js(minify_js(source)) == minify_js(source)
+
+
+def test_css_keeps_quoted_strings(minify_css):
+    source = '/* theme */\n.a::before {\n    content: "  /* x */  ";\n    color: red;\n}\n'
+    assert minify_css(source) == '.a::before{content:"  /* x */  ";color:red}\n'
@@ -0,0 +1,63 @@
+"""Prefix indexes behind /api/autocomplete, and how queued writes meet a reload"""
+import pytest
+
+
+@pytest.fixture
+def index(app_module):
+    return app_module.PrefixIndex([('Black Umbrella', 3), ('Blue Bag', 5), ('Laptop bag', 1)])
+
+
+def test_completes_any_word_start(index):
+    assert index.complete('bag', 10) == ['Blue Bag', 'Laptop bag']
+    assert index.complete('umb', 10) == ['Black Umbrella']
+    assert index.complete('x', 10) == []
+
+
+def test_ranks_by_uses_then_alphabetically(app_module, index):
+    assert index.complete('b', 10) == ['Blue Bag', 'Black Umbrella', 'Laptop bag']
+    assert index.complete('b', 2) == ['Blue Bag', 'Black Umbrella']
+    tied = app_module.PrefixIndex([('beta', 1), ('Alpha beta', 1)])
+    assert tied.complete('beta', 10) == ['Alpha beta', 'beta']
+
+
+def test_add_and_discard(index):
+    index.add('Bottle', 7)
+    assert index.complete('b', 1) == ['Bottle']
+    index.discard('Bottle', 6)
+    assert index.complete('bot', 10) == ['Bottle']
+    index.discard('Bottle', 1)
+    assert index.complete('bot', 10) == []
+    assert len(index) == 3
+
+
+def test_keep_unused_values_stay_until_removed(app_module):
+    index = app_module.PrefixIndex([('Wallet', 1)], keep_unused=True)
+    index.discard('Wallet', 1)
+    assert index.complete('wal', 10) == ['Wallet']
+    index.discard('Wallet')
+    assert index.complete('wal', 10) == []
+
+
+def test_rename_keeps_the_count(index):
+    index.rename('Blue Bag', 'Navy Bag')
+    assert index.complete('blue', 10) == []
+    assert index.complete('bag', 10) == ['Navy Bag', 'Laptop bag']
+    assert index._counts['Navy Bag'] == 5
+
+
+def test_reload_skips_queued_writes_its_snapshot_already_saw(app_module, monkeypatch):
+    autocomplete = app_module.AutocompleteIndex()
+    snapshot = {'item': app_module.PrefixIndex([('Wallet', 2)], keep_unused=True),
+                'location': app_module.PrefixIndex([('Library', 2)])}
+
+    def build():
+        # Two reports commit while the reload runs: one before its snapshot, one after
+        autocomplete.on_commit([('item', 'Wallet', 1), ('location', 'Library', 1)], {'lost_found_item': 100})
+        autocomplete.on_commit([('item', 'Wallet', 1), ('location', 'Gym', 1)], {'lost_found_item': 101})
+        return snapshot, {'lost_found_item': 100, 'item': 40}
+
+    monkeypatch.setattr(autocomplete, '_build', build)
+    autocomplete._load()
+    assert autocomplete._indexes['item']._counts == {'Wallet': 3}
+    assert autocomplete._indexes['location']._counts == {'Library': 2, 'Gym': 1}
+    assert autocomplete._pending is None
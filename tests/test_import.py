@@ -0,0 +1,69 @@
+"""Parsing and validation of /api/import rows"""
+import io
+from datetime import date
+
+import pytest
+
+ITEM_ROW = {'name': ' Black umbrella ', 'category': 'other', 'date': '2024-05-01', 'description': 'Folding',
+            'value': '1200'}
+REPORT_ROW = {'name': 'Black umbrella', 'status': 'lost', 'date': '2024-05-02', 'location': 'Library',
+              'description': 'Left on a desk', 'contact': 'someone@bubt.edu.bd'}
+CATALOGUE = {'Black umbrella': (7, 'other')}
+
+
+def test_valid_item_row(app_module):
+    values = app_module.validate_item_row(ITEM_ROW)
+    assert values['name'] == 'Black umbrella'
+    assert values['date'] == date(2024, 5, 1)
+    assert values['value'] == 1200.0
+    assert values['color'] is None
+
+
+@pytest.mark.parametrize('change, error', [
+    ({'name': '  '}, 'name is required'),
+    ({'name': 'x' * 201}, 'name must be at most 200 characters'),
+    ({'date': '01/05/2024'}, 'date must be a date in YYYY-MM-DD format'),
+    ({'value': 'cheap'}, 'value must be a number'),
+    ({'value': 'nan'}, 'value must be a finite number'),
+    ({'value': '-inf'}, 'value must be a finite number'),
+])
+def test_invalid_item_rows(app_module, change, error):
+    with pytest.raises(ValueError, match=error):
+        app_module.validate_item_row({**ITEM_ROW, **change})
+
+
+def test_report_row_takes_id_and_category_from_the_catalogue(app_module):
+    values = app_module.validate_report_row({**REPORT_ROW, 'category': 'electronics'}, CATALOGUE)
+    assert (values['item_id'], values['category'], values['status']) == (7, 'other', 'lost')
+
+
+@pytest.mark.parametrize('change, error', [
+    ({'name': 'Red umbrella'}, 'does not exist'),
+    ({'status': 'stolen'}, "status must be 'lost' or 'found'"),
+    ({'contact': None}, 'contact is required'),
+])
+def test_invalid_report_rows(app_module, change, error):
+    with pytest.raises(ValueError, match=error):
+        app_module.validate_report_row({**REPORT_ROW, **change}, CATALOGUE)
+
+
+def test_csv_records(app_module):
+    records = list(app_module.iter_import_records(io.StringIO('name,date\nUmbrella,2024-05-01\n'), 'csv'))
+    assert records == [(1, {'name': 'Umbrella', 'date': '2024-05-01'}, None)]
+
+
+def test_malformed_csv_becomes_a_row_error(app_module):
+    stream = io.StringIO('name,date\nUmbrella,2024-05-01\n"Unterminated,2024-05-02\n')
+    records = list(app_module.iter_import_records(stream, 'csv'))
+    assert records[0] == (1, {'name': 'Umbrella', 'date': '2024-05-01'}, None)
+    number, row, error = records[1]
+    assert (number, row) == (2, None)
+    assert error.startswith('Invalid CSV')
+
+
+def test_ndjson_records(app_module):
+    stream = io.StringIO('{"name": "Umbrella"}\n\nnot json\n[1, 2]\n')
+    records = list(app_module.iter_import_records(stream, 'ndjson'))
+    assert records[0] == (1, {'name': 'Umbrella'}, None)
+    assert [(number, error.split(':')[0]) for number, row, error in records[1:]] == [
+        (3, 'Invalid JSON'), (4, 'Each line must be a JSON object')]
@@ -0,0 +1,16 @@
+"""The hot report and item queries must be servable from an index"""
+import pytest
+
+
+@pytest.fixture(scope='module')
+def queries(app):
+    from app import hot_queries
+    return hot_queries()
+
+
+def test_hot_queries_avoid_sequential_scans(queries):
+    from app import sequential_scans
+
+    scans = {name: sequential_scans(statement) for name, statement in queries.items()}
+    assert {name: tables for name, tables in scans.items()
+            if {'lost_found_item', 'item'} & set(tables)} == {}
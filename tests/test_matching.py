@@ -0,0 +1,37 @@
+"""Scoring of lost/found report pairs"""
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+
+def report(name='Black umbrella', days=0, location='Library 2nd floor', description='Folding, wooden handle'):
+    return SimpleNamespace(name=name, date=date(2024, 5, 1) + timedelta(days=days),
+                           location=location, description=description)
+
+
+def test_identical_reports_score_one(app_module):
+    assert app_module.score_match(report(), report()) == 1.0
+
+
+def test_unrelated_reports_score_zero(app_module):
+    far = report('Laptop', app_module.MATCH_WINDOW_DAYS + 1, 'Gym', 'Silver')
+    assert app_module.score_match(report(), far) == 0.0
+
+
+def test_date_score_falls_off_across_the_window(app_module):
+    scores = [app_module.score_match(report(), report(days=days)) for days in (0, 1, 7, 14)]
+    assert scores == sorted(scores, reverse=True)
+    per_day = app_module.MATCH_WEIGHTS['date'] / (app_module.MATCH_WINDOW_DAYS + 1)
+    assert scores[0] - scores[1] == pytest.approx(per_day, abs=1e-4)  # scores are rounded to 4 places
+
+
+def test_score_is_symmetric(app_module):
+    a, b = report(), report('Umbrella', 3, 'Library', None)
+    assert app_module.score_match(a, b) == app_module.score_match(b, a)
+
+
+def test_token_similarity(app_module):
+    assert app_module.token_similarity('Black umbrella', 'black UMBRELLA') == 1.0
+    assert app_module.token_similarity('Black umbrella', 'Blue umbrella') == pytest.approx(1 / 3)
+    assert app_module.token_similarity('', 'anything') == 0.0
@@ -0,0 +1,17 @@
+"""Every page and API with a query budget stays within it and has no N+1 pattern"""
+
+
+def test_budgeted_routes_stay_within_budget(admin_client, sample_report):
+    from app import QueryBudgetExceeded, query_budget_urls, response_cache
+
+    failures = []
+    urls = list(query_budget_urls())
+    for rule, url in urls:
+        assert url is not None, f'no data for {rule.rule}'
+        response_cache.invalidate()  # measure the uncached path
+        try:
+            admin_client.get(url)
+        except QueryBudgetExceeded as e:
+            failures.append(str(e))
+    assert urls
+    assert not failures, '\n\n'.join(failures)
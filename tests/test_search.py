@@ -0,0 +1,32 @@
+"""Search tokens and the signed keyset cursors handed out by /api/search"""
+from datetime import date
+
+import pytest
+
+
+def test_tokenize_splits_on_punctuation_and_lowercases(app_module):
+    assert app_module.tokenize('Dell XPS-13 laptop, 2nd_floor') == ['dell', 'xps', '13', 'laptop', '2nd', 'floor']
+    assert app_module.tokenize(None) == []
+
+
+def test_date_cursor_round_trip(app_module):
+    cursor = app_module.encode_search_cursor('date-desc', date(2024, 3, 1), 42)
+    assert app_module.decode_search_cursor(cursor, 'date-desc') == (date(2024, 3, 1), 42)
+
+
+@pytest.mark.parametrize('sort_by, value', [('name-asc', 'Laptop'), ('relevance', 0.6)])
+def test_other_sorts_keep_the_value(app_module, sort_by, value):
+    cursor = app_module.encode_search_cursor(sort_by, value, 7)
+    assert app_module.decode_search_cursor(cursor, sort_by) == (value, 7)
+
+
+def test_cursor_for_another_sort_is_rejected(app_module):
+    cursor = app_module.encode_search_cursor('name-asc', 'Laptop', 7)
+    with pytest.raises(app_module.InvalidCursor, match='does not match'):
+        app_module.decode_search_cursor(cursor, 'name-desc')
+
+
+@pytest.mark.parametrize('cursor', ['junk', 'eyJzb3J0IjoibmFtZS1hc2MifQ'])
+def test_unsigned_cursor_is_rejected(app_module, cursor):
+    with pytest.raises(app_module.InvalidCursor, match='Invalid cursor'):
+        app_module.decode_search_cursor(cursor, 'name-asc')
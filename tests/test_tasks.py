@@ -0,0 +1,17 @@
+"""Retry backoff for failed background tasks"""
+import pytest
+
+
+@pytest.mark.parametrize('attempts', [1, 2, 3, 5])
+def test_retry_delay_doubles_with_jitter(app_module, attempts):
+    base = app_module.TASK_RETRY_BASE_SECONDS * 2 ** (attempts - 1)
+    delays = [app_module.task_retry_delay(attempts) for _ in range(200)]
+    assert all(base <= delay <= base * 1.5 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+def test_retry_delay_bounds(app_module, monkeypatch):
+    monkeypatch.setattr(app_module.random, 'uniform', lambda low, high: high)
+    assert app_module.task_retry_delay(1) == app_module.TASK_RETRY_BASE_SECONDS * 1.5
+    monkeypatch.setattr(app_module.random, 'uniform', lambda low, high: low)
+    assert app_module.task_retry_delay(4) == app_module.TASK_RETRY_BASE_SECONDS * 8